@@ -0,0 +1,58 @@
+"""
+Shared building blocks for the backtest scripts.
+
+The league backtests all walk matches in date order, predict each one from
+the matches played before it, then settle and summarize the bets. These
+helpers do the non-prediction parts of that loop on whole arrays.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def history_ends(history_dates: np.ndarray, match_dates: np.ndarray) -> np.ndarray:
+    """
+    Locate every match's history cut-off in one binary search.
+
+    Args:
+        history_dates: Sorted dates of the history frame
+        match_dates: Dates of the matches to predict
+
+    Returns:
+        For each match, the number of history rows dated strictly before it,
+        i.e. its history is history.iloc[:end] (or a trailing window of it)
+    """
+    return np.searchsorted(history_dates, np.asarray(match_dates, dtype=history_dates.dtype), side='left')
+
+
+def tally_bets(pattern_names: Sequence[str], outcomes: np.ndarray,
+               profits: np.ndarray) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate settled bets per pattern.
+
+    Args:
+        pattern_names: Pattern of each bet
+        outcomes: Whether each bet won
+        profits: Units won or lost by each bet
+
+    Returns:
+        {pattern: {'bets', 'wins', 'losses', 'units'}} in first-bet order
+    """
+    names = list(dict.fromkeys(pattern_names))
+    index = {name: i for i, name in enumerate(names)}
+    codes = np.fromiter((index[name] for name in pattern_names), dtype=np.intp, count=len(pattern_names))
+
+    bets = np.bincount(codes, minlength=len(names))
+    wins = np.bincount(codes, weights=outcomes, minlength=len(names)).astype(int)
+    units = np.bincount(codes, weights=profits, minlength=len(names))
+
+    return {
+        name: {
+            'bets': int(bets[i]),
+            'wins': int(wins[i]),
+            'losses': int(bets[i] - wins[i]),
+            'units': float(units[i]),
+        }
+        for i, name in enumerate(names)
+    }
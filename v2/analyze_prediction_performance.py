@@ -9,12 +9,58 @@ Usage:
     python3 analyze_prediction_performance.py predictions_20251101_20251109_backtest.txt --threshold 80
 """
 
+import sys
 import json
+import heapq
 import argparse
 from pathlib import Path
-from collections import defaultdict
 from typing import List, Dict
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MARKER = '📦 JSON'.encode('utf-8')
+
+# Prediction record fields used by the analysis
+PREDICTION_COLUMNS = ['league', 'pattern', 'risk_adjusted', 'result', 'won']
+
+# R-Adj calibration ranges: [edge[i], edge[i+1]) labelled "70-75%", ...
+CALIBRATION_EDGES = [70, 75, 80, 85, 90, 95, 100]
+CALIBRATION_LABELS = [f"{lo}-{hi}%" for lo, hi in zip(CALIBRATION_EDGES, CALIBRATION_EDGES[1:])]
+
+
+def _loads(raw):
+    """
+    Parse JSON with orjson when available, falling back to stdlib json.
+    
+    Args:
+        raw: bytes or memoryview holding the JSON document
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
+
+
+def _write_lines(lines: List[str]) -> None:
+    """Write buffered report lines to stdout in one call and clear the buffer."""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        lines.clear()
+
+
+def _group_counts(codes: np.ndarray, won: np.ndarray, lost: np.ndarray, n_groups: int) -> np.ndarray:
+    """[total, won, lost] per integer group code, as an (n_groups, 3) array."""
+    return np.stack([
+        np.bincount(codes, minlength=n_groups),
+        np.bincount(codes, weights=won, minlength=n_groups).astype(np.int64),
+        np.bincount(codes, weights=lost, minlength=n_groups).astype(np.int64),
+    ], axis=1)
+
 
 def analyze_predictions(prediction_file: str, confidence_threshold: float = 85.0):
     """
@@ -31,104 +77,111 @@ def analyze_predictions(prediction_file: str, confidence_threshold: float = 85.0
         return
     
     print(f"📖 Analyzing {prediction_file}...")
-    txt = input_path.read_text(encoding='utf-8')
+    buf = input_path.read_bytes()
     
-    # Extract JSON
-    idx = txt.find('📦 JSON')
+    # Extract JSON (search the raw bytes; only the JSON tail gets decoded)
+    idx = buf.find(JSON_MARKER)
     if idx == -1:
         print("❌ No JSON data found")
         return
     
-    json_start = txt[idx:].find('{')
-    json_data = txt[idx + json_start:]
-    data = json.loads(json_data)
+    json_start = buf.find(b'{', idx)
+    if json_start == -1:
+        print("❌ No JSON data found")
+        return
+    
+    # memoryview slicing is zero-copy; orjson parses it directly
+    data = _loads(memoryview(buf)[json_start:])
     predictions = data['predictions']
     
-    # Separate completed vs pending
-    completed = [p for p in predictions if p.get('result') == 'COMPLETE']
-    pending = [p for p in predictions if p.get('result') != 'COMPLETE']
+    # Separate completed vs pending (missing keys become NaN columns)
+    df = pd.DataFrame(predictions, columns=PREDICTION_COLUMNS)
+    completed = df[df['result'] == 'COMPLETE']
+    n_completed = len(completed)
+    n_pending = len(predictions) - n_completed
     
-    if not completed:
+    if not n_completed:
         print("⚠️  No completed predictions found. Run update_prediction_results.py first!")
         return
     
-    # Filter high-confidence bets
-    high_conf = [p for p in completed 
-                 if float(p['risk_adjusted'].strip('%')) >= confidence_threshold]
-    
-    print(f"\n📊 Total predictions: {len(predictions)}")
-    print(f"   Completed: {len(completed)}")
-    print(f"   Pending: {len(pending)}")
-    print(f"   High-confidence (≥{confidence_threshold}%): {len(high_conf)}")
-    
-    # Calculate win rates
-    def calc_stats(bets):
-        if not bets:
+    # Column arrays over completed predictions; every table below is a
+    # bincount over these rather than a Python sweep of the records.
+    conf = completed['risk_adjusted'].str.strip('%').astype(np.float64).to_numpy()
+    won = completed['won'].eq('YES').to_numpy()
+    lost = completed['won'].eq('NO').to_numpy()
+    league_codes, league_names = pd.factorize(completed['league'], sort=True)
+    pattern_codes, pattern_names = pd.factorize(completed['pattern'])
+    
+    is_high = conf >= confidence_threshold
+    
+    # Report lines are buffered per section and written with one call
+    out = []
+    out.append(f"\n📊 Total predictions: {len(predictions)}")
+    out.append(f"   Completed: {n_completed}")
+    out.append(f"   Pending: {n_pending}")
+    out.append(f"   High-confidence (≥{confidence_threshold}%): {int(is_high.sum())}")
+    
+    # Calculate win rates from [total, won, lost] counters
+    def calc_stats(counts):
+        total, n_won, n_lost = (int(c) for c in counts)
+        if not total:
             return {'total': 0, 'won': 0, 'lost': 0, 'win_rate': 0.0}
         
-        won = sum(1 for b in bets if b.get('won') == 'YES')
-        lost = sum(1 for b in bets if b.get('won') == 'NO')
         return {
-            'total': len(bets),
-            'won': won,
-            'lost': lost,
-            'win_rate': won / len(bets) * 100 if bets else 0
+            'total': total,
+            'won': n_won,
+            'lost': n_lost,
+            'win_rate': n_won / total * 100
         }
     
-    all_stats = calc_stats(completed)
-    filtered_stats = calc_stats(high_conf)
+    all_stats = calc_stats((n_completed, won.sum(), lost.sum()))
+    filtered_stats = calc_stats((is_high.sum(), won[is_high].sum(), lost[is_high].sum()))
     
     # Print overall comparison
-    print("\n" + "="*80)
-    print("🎯 OVERALL PERFORMANCE COMPARISON")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("🎯 OVERALL PERFORMANCE COMPARISON")
+    out.append("="*80)
     
-    print(f"\nAll Bets ({all_stats['total']} bets):")
-    print(f"  ✅ Won:       {all_stats['won']:3d} ({all_stats['win_rate']:.1f}%)")
-    print(f"  ❌ Lost:      {all_stats['lost']:3d} ({100-all_stats['win_rate']:.1f}%)")
+    out.append(f"\nAll Bets ({all_stats['total']} bets):")
+    out.append(f"  ✅ Won:       {all_stats['won']:3d} ({all_stats['win_rate']:.1f}%)")
+    out.append(f"  ❌ Lost:      {all_stats['lost']:3d} ({100-all_stats['win_rate']:.1f}%)")
     
-    print(f"\nFiltered Bets (R-Adj ≥ {confidence_threshold}%, {filtered_stats['total']} bets):")
-    print(f"  ✅ Won:       {filtered_stats['won']:3d} ({filtered_stats['win_rate']:.1f}%)")
-    print(f"  ❌ Lost:      {filtered_stats['lost']:3d} ({100-filtered_stats['win_rate']:.1f}%)")
+    out.append(f"\nFiltered Bets (R-Adj ≥ {confidence_threshold}%, {filtered_stats['total']} bets):")
+    out.append(f"  ✅ Won:       {filtered_stats['won']:3d} ({filtered_stats['win_rate']:.1f}%)")
+    out.append(f"  ❌ Lost:      {filtered_stats['lost']:3d} ({100-filtered_stats['win_rate']:.1f}%)")
     
     # Calculate improvement
     if all_stats['total'] > 0 and filtered_stats['total'] > 0:
         improvement = filtered_stats['win_rate'] - all_stats['win_rate']
-        print(f"\n📈 Filtering Improvement: {improvement:+.1f} percentage points")
+        out.append(f"\n📈 Filtering Improvement: {improvement:+.1f} percentage points")
         
         if improvement > 5:
-            print("   ✅ SIGNIFICANT IMPROVEMENT - Filtering is highly effective!")
+            out.append("   ✅ SIGNIFICANT IMPROVEMENT - Filtering is highly effective!")
         elif improvement > 0:
-            print("   ✅ POSITIVE IMPROVEMENT - Filtering helps")
+            out.append("   ✅ POSITIVE IMPROVEMENT - Filtering helps")
         elif improvement > -5:
-            print("   ⚠️  MINIMAL DIFFERENCE - Filtering not critical")
+            out.append("   ⚠️  MINIMAL DIFFERENCE - Filtering not critical")
         else:
-            print("   ❌ NEGATIVE IMPACT - Filtering reduces performance")
+            out.append("   ❌ NEGATIVE IMPACT - Filtering reduces performance")
+    
+    _write_lines(out)
     
     # By league comparison
-    print("\n" + "="*80)
-    print("📊 PERFORMANCE BY LEAGUE")
-    print("="*80)
-    
-    leagues = {}
-    for pred in completed:
-        league = pred['league']
-        if league not in leagues:
-            leagues[league] = {'all': [], 'filtered': []}
-        leagues[league]['all'].append(pred)
-        
-        if float(pred['risk_adjusted'].strip('%')) >= confidence_threshold:
-            leagues[league]['filtered'].append(pred)
+    out.append("\n" + "="*80)
+    out.append("📊 PERFORMANCE BY LEAGUE")
+    out.append("="*80)
     
-    print(f"\n{'League':<20} {'All Bets':<25} {'Filtered (≥{:.0f}%)'.format(confidence_threshold):<25} {'Improvement':<15}")
-    print("-"*80)
+    out.append(f"\n{'League':<20} {'All Bets':<25} {'Filtered (≥{:.0f}%)'.format(confidence_threshold):<25} {'Improvement':<15}")
+    out.append("-"*80)
     
-    for league in sorted(leagues.keys()):
-        all_bets = leagues[league]['all']
-        filt_bets = leagues[league]['filtered']
-        
-        all_s = calc_stats(all_bets)
-        filt_s = calc_stats(filt_bets)
+    n_leagues = len(league_names)
+    league_all = _group_counts(league_codes, won, lost, n_leagues)
+    league_filt = _group_counts(league_codes[is_high], won[is_high], lost[is_high], n_leagues)
+    
+    # factorize(sort=True) already yields leagues in alphabetical order
+    for i, league in enumerate(league_names):
+        all_s = calc_stats(league_all[i])
+        filt_s = calc_stats(league_filt[i])
         
         improvement = filt_s['win_rate'] - all_s['win_rate'] if filt_s['total'] > 0 else 0
         
@@ -136,64 +189,57 @@ def analyze_predictions(prediction_file: str, confidence_threshold: float = 85.0
         filt_str = f"{filt_s['won']}/{filt_s['total']} ({filt_s['win_rate']:.1f}%)" if filt_s['total'] > 0 else "N/A"
         imp_str = f"{improvement:+.1f}pp" if filt_s['total'] > 0 else "-"
         
-        print(f"{league:<20} {all_str:<25} {filt_str:<25} {imp_str:<15}")
+        out.append(f"{league:<20} {all_str:<25} {filt_str:<25} {imp_str:<15}")
+    
+    _write_lines(out)
     
     # By pattern comparison
-    print("\n" + "="*80)
-    print("📊 PERFORMANCE BY PATTERN (Top 10)")
-    print("="*80)
-    
-    patterns = defaultdict(lambda: {'all': [], 'filtered': []})
-    for pred in completed:
-        pattern = pred['pattern']
-        patterns[pattern]['all'].append(pred)
-        
-        if float(pred['risk_adjusted'].strip('%')) >= confidence_threshold:
-            patterns[pattern]['filtered'].append(pred)
+    out.append("\n" + "="*80)
+    out.append("📊 PERFORMANCE BY PATTERN (Top 10)")
+    out.append("="*80)
     
-    # Sort by total bets
-    sorted_patterns = sorted(patterns.items(), key=lambda x: len(x[1]['all']), reverse=True)[:10]
+    n_patterns = len(pattern_names)
+    pattern_all = _group_counts(pattern_codes, won, lost, n_patterns)
+    pattern_filt = _group_counts(pattern_codes[is_high], won[is_high], lost[is_high], n_patterns)
     
-    print(f"\n{'Pattern':<35} {'All Bets':<25} {'Filtered':<25} {'Diff':<10}")
-    print("-"*80)
+    # Stats computed once per pattern, top 10 by total bets
+    pattern_rows = [(pattern_names[i], calc_stats(pattern_all[i]), calc_stats(pattern_filt[i]))
+                    for i in range(n_patterns)]
+    top_patterns = heapq.nlargest(10, pattern_rows, key=lambda row: row[1]['total'])
     
-    for pattern, bets in sorted_patterns:
-        all_s = calc_stats(bets['all'])
-        filt_s = calc_stats(bets['filtered'])
-        
+    out.append(f"\n{'Pattern':<35} {'All Bets':<25} {'Filtered':<25} {'Diff':<10}")
+    out.append("-"*80)
+    
+    for pattern, all_s, filt_s in top_patterns:
         improvement = filt_s['win_rate'] - all_s['win_rate'] if filt_s['total'] > 0 else 0
         
         all_str = f"{all_s['won']}/{all_s['total']} ({all_s['win_rate']:.1f}%)"
         filt_str = f"{filt_s['won']}/{filt_s['total']} ({filt_s['win_rate']:.1f}%)" if filt_s['total'] > 0 else "N/A"
         imp_str = f"{improvement:+.1f}pp" if filt_s['total'] > 0 else "-"
         
-        print(f"{pattern:<35} {all_str:<25} {filt_str:<25} {imp_str:<10}")
+        out.append(f"{pattern:<35} {all_str:<25} {filt_str:<25} {imp_str:<10}")
+    
+    _write_lines(out)
     
     # Confidence calibration
-    print("\n" + "="*80)
-    print("📊 CONFIDENCE CALIBRATION")
-    print("="*80)
-    
-    # Group by confidence ranges
-    ranges = [
-        (70, 75, "70-75%"),
-        (75, 80, "75-80%"),
-        (80, 85, "80-85%"),
-        (85, 90, "85-90%"),
-        (90, 95, "90-95%"),
-        (95, 100, "95-100%"),
-    ]
-    
-    print(f"\n{'R-Adj Range':<15} {'Bets':<10} {'Win Rate':<15} {'Calibration':<20}")
-    print("-"*80)
-    
-    for min_conf, max_conf, label in ranges:
-        range_bets = [p for p in completed 
-                     if min_conf <= float(p['risk_adjusted'].strip('%')) < max_conf]
-        
-        if range_bets:
-            stats = calc_stats(range_bets)
-            avg_conf = sum(float(p['risk_adjusted'].strip('%')) for p in range_bets) / len(range_bets)
+    out.append("\n" + "="*80)
+    out.append("📊 CONFIDENCE CALIBRATION")
+    out.append("="*80)
+    
+    out.append(f"\n{'R-Adj Range':<15} {'Bets':<10} {'Win Rate':<15} {'Calibration':<20}")
+    out.append("-"*80)
+    
+    # Bin 0 is below the first edge and the last bin is >= 100%; bins
+    # 1..6 are the printed ranges
+    n_bins = len(CALIBRATION_EDGES) + 1
+    bins = np.digitize(conf, CALIBRATION_EDGES)
+    range_counts = _group_counts(bins, won, lost, n_bins)
+    range_conf_sum = np.bincount(bins, weights=conf, minlength=n_bins)
+    
+    for i, label in enumerate(CALIBRATION_LABELS, start=1):
+        if range_counts[i, 0]:
+            stats = calc_stats(range_counts[i])
+            avg_conf = range_conf_sum[i] / stats['total']
             calibration = stats['win_rate'] - avg_conf
             
             calib_str = f"{calibration:+.1f}pp"
@@ -204,53 +250,60 @@ def analyze_predictions(prediction_file: str, confidence_threshold: float = 85.0
             else:
                 calib_str += " ⚠️  Overconfident"
             
-            print(f"{label:<15} {stats['total']:<10} {stats['win_rate']:.1f}%{'':<10} {calib_str:<20}")
+            out.append(f"{label:<15} {stats['total']:<10} {stats['win_rate']:.1f}%{'':<10} {calib_str:<20}")
+    
+    _write_lines(out)
     
     # Recommendation
-    print("\n" + "="*80)
-    print("💡 RECOMMENDATIONS")
-    print("="*80)
+    out.append("\n" + "="*80)
+    out.append("💡 RECOMMENDATIONS")
+    out.append("="*80)
     
     if filtered_stats['win_rate'] > all_stats['win_rate'] + 5:
-        print(f"\n✅ FILTERING HIGHLY RECOMMENDED")
-        print(f"   Using R-Adj ≥ {confidence_threshold}% improves win rate by {filtered_stats['win_rate'] - all_stats['win_rate']:.1f}pp")
-        print(f"   Reduces bet count from {all_stats['total']} to {filtered_stats['total']} ({filtered_stats['total']/all_stats['total']*100:.0f}%)")
-        print(f"   Focus on quality over quantity!")
+        out.append(f"\n✅ FILTERING HIGHLY RECOMMENDED")
+        out.append(f"   Using R-Adj ≥ {confidence_threshold}% improves win rate by {filtered_stats['win_rate'] - all_stats['win_rate']:.1f}pp")
+        out.append(f"   Reduces bet count from {all_stats['total']} to {filtered_stats['total']} ({filtered_stats['total']/all_stats['total']*100:.0f}%)")
+        out.append(f"   Focus on quality over quantity!")
     elif filtered_stats['win_rate'] > all_stats['win_rate']:
-        print(f"\n✅ FILTERING RECOMMENDED")
-        print(f"   Small improvement of {filtered_stats['win_rate'] - all_stats['win_rate']:.1f}pp")
-        print(f"   Consider R-Adj ≥ {confidence_threshold}% for safer bets")
+        out.append(f"\n✅ FILTERING RECOMMENDED")
+        out.append(f"   Small improvement of {filtered_stats['win_rate'] - all_stats['win_rate']:.1f}pp")
+        out.append(f"   Consider R-Adj ≥ {confidence_threshold}% for safer bets")
     else:
-        print(f"\n⚠️  FILTERING NOT BENEFICIAL")
-        print(f"   All bets perform better than filtered subset")
-        print(f"   Consider lowering threshold or using all bets")
+        out.append(f"\n⚠️  FILTERING NOT BENEFICIAL")
+        out.append(f"   All bets perform better than filtered subset")
+        out.append(f"   Consider lowering threshold or using all bets")
     
     # Best performing combinations
-    print("\n🌟 BEST PERFORMING COMBINATIONS:")
+    out.append("\n🌟 BEST PERFORMING COMBINATIONS:")
     
-    # Find best league+pattern combos in filtered set
-    combos = defaultdict(list)
-    for pred in high_conf:
-        key = (pred['league'], pred['pattern'])
-        combos[key].append(pred)
+    # Find best league+pattern combos in filtered set: one integer code per
+    # (league, pattern) pair, counted with a single bincount
+    combo_codes = league_codes[is_high] * n_patterns + pattern_codes[is_high]
+    combo_counts = _group_counts(combo_codes, won[is_high], lost[is_high], n_leagues * n_patterns)
     
-    # Filter combos with at least 3 bets and calculate win rate
+    # Filter combos with at least 3 bets and calculate win rate, visiting
+    # them in order of first appearance so ties keep a stable order
     good_combos = []
-    for (league, pattern), bets in combos.items():
-        if len(bets) >= 3:
-            stats = calc_stats(bets)
+    _, first_seen = np.unique(combo_codes, return_index=True)
+    for code in combo_codes[np.sort(first_seen)]:
+        counts = combo_counts[code]
+        if counts[0] >= 3:
+            stats = calc_stats(counts)
             if stats['win_rate'] >= 80:
-                good_combos.append((league, pattern, stats))
+                league_code, pattern_code = divmod(int(code), n_patterns)
+                good_combos.append((league_names[league_code], pattern_names[pattern_code], stats))
     
-    # Sort by win rate
-    good_combos.sort(key=lambda x: (x[2]['win_rate'], x[2]['total']), reverse=True)
+    # Top 5 by win rate
+    top_combos = heapq.nlargest(5, good_combos, key=lambda x: (x[2]['win_rate'], x[2]['total']))
     
-    if good_combos:
-        for league, pattern, stats in good_combos[:5]:
-            print(f"   {league} | {pattern}")
-            print(f"      {stats['won']}/{stats['total']} bets ({stats['win_rate']:.1f}% win rate)")
+    if top_combos:
+        for league, pattern, stats in top_combos:
+            out.append(f"   {league} | {pattern}")
+            out.append(f"      {stats['won']}/{stats['total']} bets ({stats['win_rate']:.1f}% win rate)")
     else:
-        print("   None found (need ≥3 bets and ≥80% win rate)")
+        out.append("   None found (need ≥3 bets and ≥80% win rate)")
+    
+    _write_lines(out)
 
 
 def main():
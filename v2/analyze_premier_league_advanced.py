@@ -3,11 +3,72 @@ Premier League Advanced Improvement Analysis
 Look for ensemble patterns, team clustering, and confidence calibration.
 """
 
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from typing import Dict
 from simple_premier_league_predictor import SimplePremierLeaguePredictor
 from data.premier_league_adapter import load_premier_league_data
+from patterns.registry import evaluate_labels
+
+# Raw stat columns renamed to the names the pattern functions expect
+STAT_COLUMNS = {
+    'home_goals': 'FTHG', 'away_goals': 'FTAG',
+    'home_corners': 'HC', 'away_corners': 'AC',
+    'home_yellows': 'HY', 'away_yellows': 'AY',
+    'home_reds': 'HR', 'away_reds': 'AR'
+}
+
+# Confidence calibration buckets 55-60%, 60-65%, ..., 95-100% (lower bounds in %)
+CALIBRATION_BUCKET_LOWER = list(range(55, 100, 5))
+CALIBRATION_BUCKET_EDGES = [lower / 100 for lower in CALIBRATION_BUCKET_LOWER[1:]]
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the full-time result (FTR) column, rename stat columns and add card totals."""
+    home_goals = df['home_goals'].to_numpy()
+    away_goals = df['away_goals'].to_numpy()
+    df['FTR'] = np.where(home_goals > away_goals, 'H',
+                         np.where(away_goals > home_goals, 'A', 'D'))
+    df = df.rename(columns=STAT_COLUMNS)
+    df['HCards'] = df['HY'] + df['HR']
+    df['ACards'] = df['AY'] + df['AR']
+    return df
+
+
+@lru_cache(maxsize=1)
+def _load() -> pd.DataFrame:
+    """Load Premier League data once per process (treat as read-only)."""
+    return load_premier_league_data()
+
+
+@lru_cache(maxsize=None)
+def _season(season: str = '2024-2025') -> pd.DataFrame:
+    """Prepared frame for one season, shared across analyses (treat as read-only)."""
+    df = _load()
+    return _prepare(df[df['season'] == season].copy())
+
+
+@lru_cache(maxsize=None)
+def _season_predictions(lookback: int = 60, season: str = '2024-2025'):
+    """
+    Run the predictor once over a season and share the results.
+    
+    Returns:
+        Tuple of (predictor, predictions per match) with one entry per row
+        of the season frame, in row order
+    """
+    predictor = SimplePremierLeaguePredictor(lookback_days=lookback)
+    season_df = _season(season)
+    
+    season_predictions = predictor.predict_batch(
+        season_df['home_team'].tolist(), season_df['away_team'].tolist(), season_df['date'].tolist()
+    )
+    
+    return predictor, season_predictions
 
 
 def analyze_confidence_calibration():
@@ -17,85 +78,46 @@ def analyze_confidence_calibration():
     print("PREMIER LEAGUE CONFIDENCE CALIBRATION ANALYSIS")
     print("="*80)
     
-    df = load_premier_league_data()
-    season_df = df[df['season'] == '2024-2025'].copy()
+    predictor, season_predictions = _season_predictions(lookback=60)
     
-    # Prepare data
-    season_df['FTR'] = season_df.apply(
-        lambda row: 'H' if row['home_goals'] > row['away_goals'] 
-                    else ('A' if row['away_goals'] > row['home_goals'] else 'D'),
-        axis=1
-    )
-    season_df = season_df.rename(columns={
-        'home_goals': 'FTHG', 'away_goals': 'FTAG',
-        'home_corners': 'HC', 'away_corners': 'AC',
-        'home_yellows': 'HY', 'away_yellows': 'AY',
-        'home_reds': 'HR', 'away_reds': 'AR'
-    })
-    
-    predictor = SimplePremierLeaguePredictor(lookback_days=60)
-    
-    # Collect predictions with confidence scores
-    confidence_buckets = {
-        '55-60%': {'total': 0, 'correct': 0},
-        '60-65%': {'total': 0, 'correct': 0},
-        '65-70%': {'total': 0, 'correct': 0},
-        '70-75%': {'total': 0, 'correct': 0},
-        '75-80%': {'total': 0, 'correct': 0},
-        '80-85%': {'total': 0, 'correct': 0},
-        '85-90%': {'total': 0, 'correct': 0},
-        '90-95%': {'total': 0, 'correct': 0},
-        '95-100%': {'total': 0, 'correct': 0},
+    # Evaluate every pattern over the whole season once, then look up the
+    # outcome of each prediction by match position
+    season_df = _season('2024-2025')
+    pattern_outcomes = {
+        name: evaluate_labels(pattern['func'], season_df)
+        for name, pattern in predictor.filtered_patterns.items()
     }
     
-    for _, match in season_df.iterrows():
-        predictions = predictor.predict_match(
-            match['home_team'], match['away_team'], match['date'], verbose=False
-        )
-        
-        for pred in predictions:
-            pattern_func = predictor.filtered_patterns[pred['pattern']]['func']
-            actual = pattern_func(match)
-            confidence = pred['confidence']
-            
-            # Bucket by confidence
-            if confidence >= 0.95:
-                bucket = '95-100%'
-            elif confidence >= 0.90:
-                bucket = '90-95%'
-            elif confidence >= 0.85:
-                bucket = '85-90%'
-            elif confidence >= 0.80:
-                bucket = '80-85%'
-            elif confidence >= 0.75:
-                bucket = '75-80%'
-            elif confidence >= 0.70:
-                bucket = '70-75%'
-            elif confidence >= 0.65:
-                bucket = '65-70%'
-            elif confidence >= 0.60:
-                bucket = '60-65%'
-            else:
-                bucket = '55-60%'
-            
-            confidence_buckets[bucket]['total'] += 1
-            if actual:
-                confidence_buckets[bucket]['correct'] += 1
+    # Collect predictions with confidence scores
+    confidences = []
+    outcomes = []
+    for i, best_bet in enumerate(season_predictions):
+        if best_bet is not None:
+            outcomes.append(pattern_outcomes[best_bet.pattern_name][i])
+            confidences.append(best_bet.confidence)
+    
+    # Bucket by confidence: below 60% -> 55-60%, 95% and above -> 95-100%
+    buckets = np.digitize(confidences, CALIBRATION_BUCKET_EDGES)
+    n_buckets = len(CALIBRATION_BUCKET_LOWER)
+    totals = np.bincount(buckets, minlength=n_buckets)
+    correct = np.bincount(buckets, weights=outcomes, minlength=n_buckets)
     
     print("\nCONFIDENCE CALIBRATION:")
     print("-"*80)
     print(f"{'Confidence Range':<20} {'Predictions':<15} {'Actual WR':<15} {'Expected WR':<15} {'Calibration':<15}")
     print("-"*80)
     
-    for bucket, stats in confidence_buckets.items():
-        if stats['total'] > 0:
-            actual_wr = stats['correct'] / stats['total']
-            expected_wr = float(bucket.split('-')[0].replace('%', '')) / 100
+    for i, lower in enumerate(CALIBRATION_BUCKET_LOWER):
+        total = int(totals[i])
+        if total > 0:
+            bucket = f"{lower}-{lower + 5}%"
+            actual_wr = correct[i] / total
+            expected_wr = lower / 100
             calibration = actual_wr - expected_wr
             
             calibration_status = "✅ Good" if abs(calibration) < 0.05 else ("⚠️ Over-confident" if calibration < -0.05 else "⚠️ Under-confident")
             
-            print(f"{bucket:<20} {stats['total']:<15} {actual_wr:>13.1%} {expected_wr:>13.1%} {calibration:>+13.1%} {calibration_status}")
+            print(f"{bucket:<20} {total:<15} {actual_wr:>13.1%} {expected_wr:>13.1%} {calibration:>+13.1%} {calibration_status}")
 
 
 def analyze_pattern_combinations():
@@ -105,34 +127,15 @@ def analyze_pattern_combinations():
     print("PATTERN COMBINATION ANALYSIS")
     print("="*80)
     
-    df = load_premier_league_data()
-    season_df = df[df['season'] == '2024-2025'].copy()
-    
-    # Prepare data
-    season_df['FTR'] = season_df.apply(
-        lambda row: 'H' if row['home_goals'] > row['away_goals'] 
-                    else ('A' if row['away_goals'] > row['home_goals'] else 'D'),
-        axis=1
-    )
-    season_df = season_df.rename(columns={
-        'home_goals': 'FTHG', 'away_goals': 'FTAG',
-        'home_corners': 'HC', 'away_corners': 'AC',
-        'home_yellows': 'HY', 'away_yellows': 'AY',
-        'home_reds': 'HR', 'away_reds': 'AR'
-    })
-    
-    predictor = SimplePremierLeaguePredictor(lookback_days=60)
+    _, season_predictions = _season_predictions(lookback=60)
     
     # Track which patterns fire together
     match_patterns = []
     
-    for _, match in season_df.iterrows():
-        predictions = predictor.predict_match(
-            match['home_team'], match['away_team'], match['date'], verbose=False
-        )
-        
-        if predictions:
-            fired_patterns = [p['pattern'] for p in predictions]
+    for best_bet in season_predictions:
+        if best_bet is not None:
+            # predict() reports only the best-ranked pattern of each match
+            fired_patterns = [best_bet.pattern_name]
             match_patterns.append({
                 'patterns': fired_patterns,
                 'count': len(fired_patterns)
@@ -142,13 +145,47 @@ def analyze_pattern_combinations():
     print("\nMATCHES WITH MULTIPLE PATTERNS:")
     print("-"*80)
     
-    pattern_counts = [m['count'] for m in match_patterns if m['count'] > 0]
-    if pattern_counts:
-        print(f"Avg patterns per match: {np.mean(pattern_counts):.1f}")
-        print(f"Max patterns in one match: {max(pattern_counts)}")
-        print(f"Matches with 10+ patterns: {sum(1 for c in pattern_counts if c >= 10)}")
-        print(f"Matches with 5-9 patterns: {sum(1 for c in pattern_counts if 5 <= c < 10)}")
-        print(f"Matches with 1-4 patterns: {sum(1 for c in pattern_counts if 1 <= c < 5)}")
+    pattern_counts = np.fromiter((m['count'] for m in match_patterns if m['count'] > 0), dtype=np.int32)
+    if pattern_counts.size:
+        # Size classes 1-4, 5-9 and 10+ in one vectorized pass
+        one_to_four, five_to_nine, ten_plus = np.bincount(np.digitize(pattern_counts, [5, 10]), minlength=3)
+        print(f"Avg patterns per match: {pattern_counts.mean():.1f}")
+        print(f"Max patterns in one match: {pattern_counts.max()}")
+        print(f"Matches with 10+ patterns: {ten_plus}")
+        print(f"Matches with 5-9 patterns: {five_to_nine}")
+        print(f"Matches with 1-4 patterns: {one_to_four}")
+
+
+def _team_stats(season_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-team home/away averages from two groupby passes.
+    
+    Returns:
+        DataFrame indexed by team with avg_* columns, total_corners
+        (corners per match across home and away games) and total_cards.
+    """
+    home_corners = season_df['HC'] + season_df['AC']
+    home = season_df.assign(match_corners=home_corners).groupby('home_team').agg(
+        avg_home_corners=('HC', 'mean'),
+        avg_home_goals=('FTHG', 'mean'),
+        home_corner_sum=('match_corners', 'sum'),
+        home_count=('HC', 'size'),
+        avg_home_cards=('HCards', 'mean'),
+    )
+    
+    away = season_df.assign(match_corners=home_corners).groupby('away_team').agg(
+        avg_away_corners=('AC', 'mean'),
+        avg_away_goals=('FTAG', 'mean'),
+        away_corner_sum=('match_corners', 'sum'),
+        away_count=('AC', 'size'),
+        avg_away_cards=('ACards', 'mean'),
+    )
+    
+    stats = home.join(away, how='outer').fillna(0)
+    stats['total_corners'] = ((stats['home_corner_sum'] + stats['away_corner_sum']) /
+                              (stats['home_count'] + stats['away_count']))
+    stats['total_cards'] = stats['avg_home_cards'] + stats['avg_away_cards']
+    return stats
 
 
 def analyze_team_specialties():
@@ -158,48 +195,17 @@ def analyze_team_specialties():
     print("TEAM SPECIALTY ANALYSIS")
     print("="*80)
     
-    df = load_premier_league_data()
-    season_df = df[df['season'] == '2024-2025'].copy()
-    
-    # Prepare data
-    season_df['FTR'] = season_df.apply(
-        lambda row: 'H' if row['home_goals'] > row['away_goals'] 
-                    else ('A' if row['away_goals'] > row['home_goals'] else 'D'),
-        axis=1
-    )
-    season_df = season_df.rename(columns={
-        'home_goals': 'FTHG', 'away_goals': 'FTAG',
-        'home_corners': 'HC', 'away_corners': 'AC',
-        'home_yellows': 'HY', 'away_yellows': 'AY',
-        'home_reds': 'HR', 'away_reds': 'AR'
-    })
+    season_df = _season('2024-2025')
     
     # Calculate team stats
-    team_stats = {}
-    
-    for team in set(season_df['home_team'].unique()) | set(season_df['away_team'].unique()):
-        home_matches = season_df[season_df['home_team'] == team]
-        away_matches = season_df[season_df['away_team'] == team]
-        
-        team_stats[team] = {
-            'avg_home_corners': home_matches['HC'].mean() if len(home_matches) > 0 else 0,
-            'avg_away_corners': away_matches['AC'].mean() if len(away_matches) > 0 else 0,
-            'avg_home_cards': (home_matches['HY'] + home_matches['HR']).mean() if len(home_matches) > 0 else 0,
-            'avg_away_cards': (away_matches['AY'] + away_matches['AR']).mean() if len(away_matches) > 0 else 0,
-            'avg_home_goals': home_matches['FTHG'].mean() if len(home_matches) > 0 else 0,
-            'avg_away_goals': away_matches['FTAG'].mean() if len(away_matches) > 0 else 0,
-            'total_corners': (home_matches['HC'].sum() + home_matches['AC'].sum() + 
-                            away_matches['HC'].sum() + away_matches['AC'].sum()) / 
-                           (len(home_matches) + len(away_matches)) if (len(home_matches) + len(away_matches)) > 0 else 0
-        }
+    team_stats = _team_stats(season_df)
     
     print("\nTOP 10 HIGH CORNER TEAMS (Total corners per match):")
     print("-"*80)
     print(f"{'Team':<25} {'Avg Total Corners':<20} {'Home Corners':<15} {'Away Corners':<15}")
     print("-"*80)
     
-    sorted_teams = sorted(team_stats.items(), key=lambda x: x[1]['total_corners'], reverse=True)
-    for team, stats in sorted_teams[:10]:
+    for team, stats in team_stats.nlargest(10, 'total_corners').iterrows():
         print(f"{team:<25} {stats['total_corners']:>18.1f} {stats['avg_home_corners']:>13.1f} {stats['avg_away_corners']:>13.1f}")
     
     print("\nTOP 10 HIGH CARD TEAMS (Cards per match):")
@@ -207,8 +213,7 @@ def analyze_team_specialties():
     print(f"{'Team':<25} {'Home Cards':<15} {'Away Cards':<15}")
     print("-"*80)
     
-    sorted_teams = sorted(team_stats.items(), key=lambda x: x[1]['avg_home_cards'] + x[1]['avg_away_cards'], reverse=True)
-    for team, stats in sorted_teams[:10]:
+    for team, stats in team_stats.nlargest(10, 'total_cards').iterrows():
         print(f"{team:<25} {stats['avg_home_cards']:>13.1f} {stats['avg_away_cards']:>13.1f}")
     
     print("\nTOP 10 LOW CORNER TEAMS (avoid for corner bets):")
@@ -216,11 +221,57 @@ def analyze_team_specialties():
     print(f"{'Team':<25} {'Avg Total Corners':<20}")
     print("-"*80)
     
-    sorted_teams = sorted(team_stats.items(), key=lambda x: x[1]['total_corners'])
-    for team, stats in sorted_teams[:10]:
+    for team, stats in team_stats.nsmallest(10, 'total_corners').iterrows():
         print(f"{team:<25} {stats['total_corners']:>18.1f}")
 
 
+LOOKBACK_PERIODS = [14, 21, 30, 45, 60, 90]
+
+
+@lru_cache(maxsize=1)
+def _lookback_test_df() -> pd.DataFrame:
+    """Prepared test window for the lookback sweep (treat as read-only)."""
+    df = _load()
+    return _prepare(df[(df['date'] >= '2025-09-01') & (df['date'] < '2025-10-10')].copy())
+
+
+def _run_lookback(lookback: int) -> Dict:
+    """
+    Score one lookback period over the test window.
+    
+    Top-level so it can run in a worker process; each worker loads and
+    prepares the data through its own cached loaders.
+    """
+    test_df = _lookback_test_df()
+    predictor = SimplePremierLeaguePredictor(lookback_days=lookback)
+    
+    batch_predictions = predictor.predict_batch(
+        test_df['home_team'].tolist(), test_df['away_team'].tolist(), test_df['date'].tolist()
+    )
+    pattern_outcomes = {
+        name: evaluate_labels(pattern['func'], test_df)
+        for name, pattern in predictor.filtered_patterns.items()
+    }
+    
+    total = 0
+    correct = 0
+    profit = 0.0
+    
+    for i, best_bet in enumerate(batch_predictions):
+        if best_bet is not None:
+            actual = pattern_outcomes[best_bet.pattern_name][i]
+            
+            total += 1
+            if actual:
+                correct += 1
+                profit += 1.0
+            else:
+                profit -= 1.0
+    
+    wr = (correct / total * 100) if total > 0 else 0
+    return {'lookback': lookback, 'total': total, 'wr': wr, 'profit': profit}
+
+
 def analyze_lookback_sensitivity():
     """Test if different lookback periods would improve results."""
     
@@ -228,57 +279,22 @@ def analyze_lookback_sensitivity():
     print("LOOKBACK PERIOD SENSITIVITY ANALYSIS")
     print("="*80)
     
-    df = load_premier_league_data()
-    test_df = df[(df['date'] >= '2025-09-01') & (df['date'] < '2025-10-10')].copy()
-    
-    # Prepare data
-    test_df['FTR'] = test_df.apply(
-        lambda row: 'H' if row['home_goals'] > row['away_goals'] 
-                    else ('A' if row['away_goals'] > row['home_goals'] else 'D'),
-        axis=1
-    )
-    test_df = test_df.rename(columns={
-        'home_goals': 'FTHG', 'away_goals': 'FTAG',
-        'home_corners': 'HC', 'away_corners': 'AC',
-        'home_yellows': 'HY', 'away_yellows': 'AY',
-        'home_reds': 'HR', 'away_reds': 'AR'
-    })
+    test_df = _lookback_test_df()
     
     print(f"\nTest matches: {len(test_df)}")
     print(f"Period: {test_df['date'].min().strftime('%Y-%m-%d')} to {test_df['date'].max().strftime('%Y-%m-%d')}")
-    print("\nTesting lookback periods: 14, 21, 30, 45, 60, 90 days")
+    print(f"\nTesting lookback periods: {', '.join(str(d) for d in LOOKBACK_PERIODS)} days")
     print("-"*80)
     print(f"{'Lookback':<12} {'Predictions':<15} {'Win Rate':<15} {'Profit':<15}")
     print("-"*80)
     
-    results = []
-    for lookback in [14, 21, 30, 45, 60, 90]:
-        predictor = SimplePremierLeaguePredictor(lookback_days=lookback)
-        
-        total = 0
-        correct = 0
-        profit = 0.0
-        
-        for _, match in test_df.iterrows():
-            predictions = predictor.predict_match(
-                match['home_team'], match['away_team'], match['date'], verbose=False
-            )
-            
-            for pred in predictions:
-                pattern_func = predictor.filtered_patterns[pred['pattern']]['func']
-                actual = pattern_func(match)
-                
-                total += 1
-                if actual:
-                    correct += 1
-                    profit += 1.0
-                else:
-                    profit -= 1.0
-        
-        wr = (correct / total * 100) if total > 0 else 0
-        results.append({'lookback': lookback, 'total': total, 'wr': wr, 'profit': profit})
-        
-        print(f"{lookback} days{'':<5} {total:<15} {wr:>13.1f}% {profit:>+13.1f}")
+    # Each lookback is independent and CPU-bound, so run them in parallel
+    workers = min(len(LOOKBACK_PERIODS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_run_lookback, LOOKBACK_PERIODS))
+    
+    for r in results:
+        print(f"{r['lookback']} days{'':<5} {r['total']:<15} {r['wr']:>13.1f}% {r['profit']:>+13.1f}")
     
     best = max(results, key=lambda x: x['profit'])
     print(f"\n✅ Best lookback: {best['lookback']} days ({best['wr']:.1f}% WR, {best['profit']:+.1f} units)")
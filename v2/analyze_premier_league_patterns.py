@@ -3,36 +3,99 @@ Premier League Pattern Analysis
 Deep dive into pattern performance to identify improvement opportunities.
 """
 
+import io
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from functools import partial
+from typing import Dict
 from simple_premier_league_predictor import SimplePremierLeaguePredictor
 from data.premier_league_adapter import load_premier_league_data
 
+# Category table columns and their display headers
+REPORT_COLUMNS = {
+    'pattern': 'Pattern',
+    'total': 'Count',
+    'win_rate': 'WR',
+    'profit': 'Profit',
+    'threshold': 'Threshold',
+    'avg_confidence': 'Avg Conf',
+}
 
-def analyze_pattern_performance(lookback_days: int = 60):
-    """Analyze individual pattern performance across full season."""
+REPORT_FORMATTERS = {
+    'Pattern': '{:<30}'.format,
+    'WR': '{:.1f}%'.format,
+    'Profit': '{:+.1f}'.format,
+    'Threshold': '{:.2f}'.format,
+    'Avg Conf': '{:.1%}'.format,
+}
+
+
+def _pattern_category(pattern_name: str) -> str:
+    """Report category of a pattern: 'corner', 'card', 'goal' or 'other'."""
+    lname = pattern_name.lower()
+    if 'corner' in lname:
+        return 'corner'
+    if 'card' in lname:
+        return 'card'
+    if 'goal' in lname or 'win' in lname or 'draw' in lname:
+        return 'goal'
+    return 'other'
+
+
+def _tally_patterns(pattern_codes: np.ndarray, confidences: np.ndarray,
+                    correct: np.ndarray, n_patterns: int) -> Dict[str, np.ndarray]:
+    """
+    Group prediction arrays by pattern code.
     
-    print("="*80)
-    print("PREMIER LEAGUE PATTERN PERFORMANCE ANALYSIS")
-    print("="*80)
+    Returns:
+        Dict of per-pattern arrays: total, correct, profit (+1/-1 per bet),
+        conf_sum, conf_min and conf_max
+    """
+    total = np.bincount(pattern_codes, minlength=n_patterns)
+    n_correct = np.bincount(pattern_codes[correct], minlength=n_patterns)
     
-    # Load full dataset
-    df = load_premier_league_data()
+    conf_min = np.full(n_patterns, np.inf)
+    conf_max = np.full(n_patterns, -np.inf)
+    np.minimum.at(conf_min, pattern_codes, confidences)
+    np.maximum.at(conf_max, pattern_codes, confidences)
     
-    # Test on 2024-25 season (complete or near-complete)
-    season_df = df[df['season'] == '2024-2025'].copy()
+    return {
+        'total': total,
+        'correct': n_correct,
+        'profit': (2 * n_correct - total).astype(np.float64),
+        'conf_sum': np.bincount(pattern_codes, weights=confidences, minlength=n_patterns),
+        'conf_min': conf_min,
+        'conf_max': conf_max,
+    }
+
+
+def _print_category(stats_df: pd.DataFrame, title: str, mask: pd.Series) -> None:
+    """Print one category of pattern stats as a table sorted by win rate."""
+    print(f"\n{'='*80}")
+    print(title)
+    print(f"{'='*80}")
     
-    print(f"\nAnalyzing Season: 2024-2025")
-    print(f"Matches: {len(season_df)}")
-    print(f"Date range: {season_df['date'].min().strftime('%Y-%m-%d')} to {season_df['date'].max().strftime('%Y-%m-%d')}")
-    print(f"Lookback: {lookback_days} days")
+    table = stats_df.loc[mask, list(REPORT_COLUMNS)].sort_values('win_rate', ascending=False, kind='stable')
+    if table.empty:
+        return
     
-    # Prepare data
-    season_df['FTR'] = season_df.apply(
-        lambda row: 'H' if row['home_goals'] > row['away_goals'] 
-                    else ('A' if row['away_goals'] > row['home_goals'] else 'D'),
-        axis=1
-    )
+    table = table.rename(columns=REPORT_COLUMNS)
+    print(table.to_string(index=False, justify='left', formatters=REPORT_FORMATTERS))
+
+
+def prepare_season(season: str = '2024-2025') -> pd.DataFrame:
+    """Load Premier League data and prepare one season (FTR + pattern column names)."""
+    df = load_premier_league_data()
+    season_df = df[df['season'] == season].copy()
+    
+    home_goals = season_df['home_goals'].to_numpy()
+    away_goals = season_df['away_goals'].to_numpy()
+    season_df['FTR'] = np.where(home_goals > away_goals, 'H',
+                                np.where(away_goals > home_goals, 'A', 'D'))
     season_df = season_df.rename(columns={
         'home_goals': 'FTHG',
         'away_goals': 'FTAG',
@@ -43,93 +106,89 @@ def analyze_pattern_performance(lookback_days: int = 60):
         'home_reds': 'HR',
         'away_reds': 'AR'
     })
+    return season_df
+
+
+def analyze_pattern_performance(season_df: pd.DataFrame, lookback_days: int = 60):
+    """
+    Analyze individual pattern performance across full season.
+    
+    Args:
+        season_df: Season frame from prepare_season()
+        lookback_days: Predictor lookback window
+    """
+    
+    print("="*80)
+    print("PREMIER LEAGUE PATTERN PERFORMANCE ANALYSIS")
+    print("="*80)
+    
+    print(f"\nAnalyzing Season: 2024-2025")
+    print(f"Matches: {len(season_df)}")
+    print(f"Date range: {season_df['date'].min().strftime('%Y-%m-%d')} to {season_df['date'].max().strftime('%Y-%m-%d')}")
+    print(f"Lookback: {lookback_days} days")
     
     # Create predictor
     predictor = SimplePremierLeaguePredictor(lookback_days=lookback_days)
     
-    # Track detailed pattern stats
-    pattern_stats = {}
+    # Collect one entry per prediction; patterns are indexed in first-seen order
+    pattern_idx = {}
+    pred_patterns = []
+    pred_confidences = []
+    pred_correct = []
+    pattern_funcs = {name: pattern['func'] for name, pattern in predictor.filtered_patterns.items()}
+    
+    # Extract the loop inputs once; pattern functions take plain dict rows
+    home_teams = season_df['home_team'].tolist()
+    away_teams = season_df['away_team'].tolist()
+    match_dates = season_df['date'].tolist()
+    match_rows = season_df.to_dict('records')
     
-    for _, match in season_df.iterrows():
+    for home_team, away_team, match_date, match in zip(home_teams, away_teams, match_dates, match_rows):
         predictions = predictor.predict_match(
-            match['home_team'],
-            match['away_team'],
-            match['date'],
+            home_team,
+            away_team,
+            match_date,
             verbose=False
         )
         
         for pred in predictions:
             pattern_name = pred['pattern']
-            pattern_func = predictor.filtered_patterns[pattern_name]['func']
-            actual_result = pattern_func(match)
-            
-            if pattern_name not in pattern_stats:
-                pattern_stats[pattern_name] = {
-                    'total': 0,
-                    'correct': 0,
-                    'profit': 0.0,
-                    'confidences': [],
-                    'threshold': pred['base_threshold']
-                }
-            
-            pattern_stats[pattern_name]['total'] += 1
-            pattern_stats[pattern_name]['confidences'].append(pred['confidence'])
-            
-            if actual_result:
-                pattern_stats[pattern_name]['correct'] += 1
-                pattern_stats[pattern_name]['profit'] += 1.0
-            else:
-                pattern_stats[pattern_name]['profit'] -= 1.0
-    
-    # Calculate statistics
-    for pattern_name, stats in pattern_stats.items():
-        stats['win_rate'] = (stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0
-        stats['avg_confidence'] = sum(stats['confidences']) / len(stats['confidences']) if stats['confidences'] else 0
-        stats['min_confidence'] = min(stats['confidences']) if stats['confidences'] else 0
-        stats['max_confidence'] = max(stats['confidences']) if stats['confidences'] else 0
-    
-    # Report by category
-    print(f"\n{'='*80}")
-    print("CORNER PATTERNS (sorted by win rate)")
-    print(f"{'='*80}")
-    print(f"{'Pattern':<30} {'Count':<8} {'WR':<8} {'Profit':<10} {'Threshold':<10} {'Avg Conf':<10}")
-    print("-"*80)
-    
-    corner_patterns = [(name, stats) for name, stats in pattern_stats.items() 
-                      if 'corner' in name.lower()]
-    corner_patterns.sort(key=lambda x: x[1]['win_rate'], reverse=True)
-    
-    for pattern_name, stats in corner_patterns:
-        print(f"{pattern_name:<30} {stats['total']:<8} {stats['win_rate']:>6.1f}% "
-              f"{stats['profit']:>+8.1f} {stats['threshold']:>8.2f} {stats['avg_confidence']:>8.1%}")
+            pred_patterns.append(pattern_idx.setdefault(pattern_name, len(pattern_idx)))
+            pred_confidences.append(pred['confidence'])
+            pred_correct.append(bool(pattern_funcs[pattern_name](match)))
     
-    print(f"\n{'='*80}")
-    print("GOAL PATTERNS (sorted by win rate)")
-    print(f"{'='*80}")
-    print(f"{'Pattern':<30} {'Count':<8} {'WR':<8} {'Profit':<10} {'Threshold':<10} {'Avg Conf':<10}")
-    print("-"*80)
-    
-    goal_patterns = [(name, stats) for name, stats in pattern_stats.items() 
-                    if 'goal' in name.lower() or 'win' in name.lower() or 'draw' in name.lower()]
-    goal_patterns.sort(key=lambda x: x[1]['win_rate'], reverse=True)
-    
-    for pattern_name, stats in goal_patterns:
-        print(f"{pattern_name:<30} {stats['total']:<8} {stats['win_rate']:>6.1f}% "
-              f"{stats['profit']:>+8.1f} {stats['threshold']:>8.2f} {stats['avg_confidence']:>8.1%}")
+    # Per-pattern totals in one pass over the prediction arrays
+    tally = _tally_patterns(
+        np.array(pred_patterns, dtype=np.int64),
+        np.array(pred_confidences, dtype=np.float64),
+        np.array(pred_correct, dtype=bool),
+        len(pattern_idx)
+    )
     
-    print(f"\n{'='*80}")
-    print("CARD PATTERNS (sorted by win rate)")
-    print(f"{'='*80}")
-    print(f"{'Pattern':<30} {'Count':<8} {'WR':<8} {'Profit':<10} {'Threshold':<10} {'Avg Conf':<10}")
-    print("-"*80)
+    # Calculate statistics (every tallied pattern has at least one prediction)
+    pattern_stats = {}
+    for pattern_name, i in pattern_idx.items():
+        total = int(tally['total'][i])
+        pattern_stats[pattern_name] = {
+            'total': total,
+            'correct': int(tally['correct'][i]),
+            'profit': float(tally['profit'][i]),
+            'threshold': predictor.filtered_patterns[pattern_name]['threshold'],
+            'category': _pattern_category(pattern_name),
+            'win_rate': tally['correct'][i] / total * 100,
+            'avg_confidence': tally['conf_sum'][i] / total,
+            'min_confidence': tally['conf_min'][i],
+            'max_confidence': tally['conf_max'][i],
+        }
     
-    card_patterns = [(name, stats) for name, stats in pattern_stats.items() 
-                    if 'card' in name.lower()]
-    card_patterns.sort(key=lambda x: x[1]['win_rate'], reverse=True)
+    # Report by category
+    stats_df = pd.DataFrame.from_dict(pattern_stats, orient='index', columns=list(REPORT_COLUMNS)[1:] + ['category'])
+    stats_df.index = stats_df.index.astype(str).rename('pattern')
+    stats_df = stats_df.reset_index()
     
-    for pattern_name, stats in card_patterns:
-        print(f"{pattern_name:<30} {stats['total']:<8} {stats['win_rate']:>6.1f}% "
-              f"{stats['profit']:>+8.1f} {stats['threshold']:>8.2f} {stats['avg_confidence']:>8.1%}")
+    _print_category(stats_df, "CORNER PATTERNS (sorted by win rate)", stats_df['category'] == 'corner')
+    _print_category(stats_df, "GOAL PATTERNS (sorted by win rate)", stats_df['category'] == 'goal')
+    _print_category(stats_df, "CARD PATTERNS (sorted by win rate)", stats_df['category'] == 'card')
     
     # Identify optimization opportunities
     print(f"\n{'='*80}")
@@ -179,10 +238,10 @@ def analyze_pattern_performance(lookback_days: int = 60):
               f"Profit: {stats['profit']:>+7.1f} | Threshold: {stats['threshold']:.2f}")
     
     # Overall summary
-    total_predictions = sum(s['total'] for s in pattern_stats.values())
-    total_correct = sum(s['correct'] for s in pattern_stats.values())
-    total_profit = sum(s['profit'] for s in pattern_stats.values())
-    overall_wr = (total_correct / total_predictions * 100) if total_predictions > 0 else 0
+    total_predictions = int(tally['total'].sum())
+    total_correct = int(tally['correct'].sum())
+    total_profit = float(tally['profit'].sum())
+    overall_wr = total_correct / max(total_predictions, 1) * 100
     
     print(f"\n{'='*80}")
     print("OVERALL SUMMARY")
@@ -193,8 +252,21 @@ def analyze_pattern_performance(lookback_days: int = 60):
     print(f"Active Patterns: {len(pattern_stats)}")
 
 
+def _run_lookback(season_df: pd.DataFrame, lookback_days: int) -> str:
+    """Run one lookback analysis in a worker process and return its report."""
+    report = io.StringIO()
+    with redirect_stdout(report):
+        analyze_pattern_performance(season_df, lookback_days)
+    return report.getvalue()
+
+
 if __name__ == "__main__":
-    # Test different lookback periods
-    for lookback in [30, 60, 90]:
-        analyze_pattern_performance(lookback)
-        print("\n" * 2)
+    # Test different lookback periods in parallel on one prepared season
+    season_df = prepare_season()
+    lookbacks = [30, 60, 90]
+    
+    workers = min(len(lookbacks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for report in executor.map(partial(_run_lookback, season_df), lookbacks):
+            print(report, end='')
+            print("\n" * 2)
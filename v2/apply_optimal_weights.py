@@ -3,6 +3,16 @@ Apply Optimal Weights to All League Predictors
 Updates each predictor file with its league-specific optimal weight configuration
 """
 
+# "Extreme Recent" timeframe weights, shared by every league that uses them
+# (one object referenced from several entries; treat as read-only)
+EXTREME_RECENT_WEIGHTS = {
+    7: 0.40,    # Last 7 days: 40%
+    14: 0.30,   # Last 14 days: 30%
+    30: 0.15,   # Last 30 days: 15%
+    90: 0.10,   # Last 90 days: 10%
+    365: 0.05   # Last 365 days: 5%
+}
+
 # Optimal weights determined from testing
 OPTIMAL_WEIGHTS = {
     "Serie A": {
@@ -20,49 +30,25 @@ OPTIMAL_WEIGHTS = {
     },
     "Bundesliga": {
         "config_name": "Extreme Recent",
-        "weights": {
-            7: 0.40,    # Last 7 days: 40%
-            14: 0.30,   # Last 14 days: 30%
-            30: 0.15,   # Last 30 days: 15%
-            90: 0.10,   # Last 90 days: 10%
-            365: 0.05   # Last 365 days: 5%
-        },
+        "weights": EXTREME_RECENT_WEIGHTS,
         "win_rate": 100.0,
         "avg_confidence": 96.8
     },
     "La Liga": {
         "config_name": "Extreme Recent",
-        "weights": {
-            7: 0.40,    # Last 7 days: 40%
-            14: 0.30,   # Last 14 days: 30%
-            30: 0.15,   # Last 30 days: 15%
-            90: 0.10,   # Last 90 days: 10%
-            365: 0.05   # Last 365 days: 5%
-        },
+        "weights": EXTREME_RECENT_WEIGHTS,
         "win_rate": 100.0,
         "avg_confidence": 95.9
     },
     "Premier League": {
         "config_name": "Extreme Recent",
-        "weights": {
-            7: 0.40,    # Last 7 days: 40%
-            14: 0.30,   # Last 14 days: 30%
-            30: 0.15,   # Last 30 days: 15%
-            90: 0.10,   # Last 90 days: 10%
-            365: 0.05   # Last 365 days: 5%
-        },
+        "weights": EXTREME_RECENT_WEIGHTS,
         "win_rate": 82.5,
         "avg_confidence": 89.5
     },
     "Romania": {
         "config_name": "Extreme Recent",
-        "weights": {
-            7: 0.40,    # Last 7 days: 40%
-            14: 0.30,   # Last 14 days: 30%
-            30: 0.15,   # Last 30 days: 15%
-            90: 0.10,   # Last 90 days: 10%
-            365: 0.05   # Last 365 days: 5%
-        },
+        "weights": EXTREME_RECENT_WEIGHTS,
         "win_rate": 100.0,
         "avg_confidence": 96.5
     }
@@ -2,9 +2,15 @@
 Backtest all 5 leagues over the last 14 days to validate current performance.
 """
 
+import io
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from collections import Counter
 
 # Import all predictors
 from simple_serie_a_predictor import SimpleSerieAPredictor
@@ -19,6 +25,51 @@ from data.bundesliga_adapter import load_bundesliga_data
 from data.la_liga_adapter import load_la_liga_data
 from data.premier_league_adapter import load_premier_league_data
 from data.romanian_adapter import load_romanian_data
+from patterns.registry import get_pattern_registry
+
+# Errors a predictor or pattern function may raise for a single match
+# (missing team history, missing stat columns, malformed values)
+MATCH_ERRORS = (KeyError, AttributeError, ValueError, TypeError, IndexError)
+
+
+def _resolve_predict_fn(predictor):
+    """
+    Pick the prediction interface a predictor supports.
+    
+    Returns:
+        Function (home_team, away_team, historical, match_date) -> prediction,
+        or None if the predictor has no known interface
+    """
+    if hasattr(predictor, 'predict_match') and 'historical_data' not in predictor.predict_match.__code__.co_varnames:
+        def predict_fn(home_team, away_team, historical, match_date):
+            return predictor.predict_match(
+                home_team=home_team,
+                away_team=away_team,
+                match_date=match_date
+            )
+    elif hasattr(predictor, 'predict_match_simple'):
+        def predict_fn(home_team, away_team, historical, match_date):
+            # Update predictor's data temporarily
+            old_data = predictor.data
+            predictor.data = historical
+            prediction = predictor.predict_match_simple(
+                home_team=home_team,
+                away_team=away_team,
+                match_date=match_date
+            )
+            predictor.data = old_data
+            return prediction
+    elif hasattr(predictor, 'predict_match'):
+        def predict_fn(home_team, away_team, historical, match_date):
+            return predictor.predict_match(
+                home_team=home_team,
+                away_team=away_team,
+                historical_data=historical,
+                match_date=match_date
+            )
+    else:
+        predict_fn = None
+    return predict_fn
 
 
 def backtest_league(league_name, predictor, all_data, days=14):
@@ -45,11 +96,13 @@ def backtest_league(league_name, predictor, all_data, days=14):
     print(f"Latest historical: {latest_date.date()}")
     print(f"Backtesting from: {cutoff_date.date()} to {latest_date.date()}")
     
-    # Get matches in the backtest period
-    test_matches = all_data[
-        (all_data['Date'] > cutoff_date) & 
-        (all_data['Date'] <= latest_date)
-    ].sort_values('Date')
+    # Get matches in the backtest period as a slice of the date-sorted data
+    if not all_data['Date'].is_monotonic_increasing:
+        all_data = all_data.sort_values('Date', kind='stable')
+    dates = all_data['Date'].to_numpy()
+    lo = np.searchsorted(dates, np.datetime64(cutoff_date), side='right')
+    hi = np.searchsorted(dates, np.datetime64(latest_date), side='right')
+    test_matches = all_data.iloc[lo:hi]
     
     print(f"Found {len(test_matches)} matches to test")
     
@@ -57,96 +110,91 @@ def backtest_league(league_name, predictor, all_data, days=14):
         print("⚠️  No matches in backtest period")
         return None
     
-    # Results tracking
-    predictions = []
+    # Results tracking; at most one prediction per match, filled by index
+    # (total is the write position) and trimmed after the loop
+    predictions = [None] * len(test_matches)
     correct = 0
     total = 0
-    by_pattern = defaultdict(lambda: {'correct': 0, 'total': 0})
+    correct_by_pattern = Counter()
+    total_by_pattern = Counter()
+    
+    # Interface dispatch and registered patterns are fixed for the whole run,
+    # so snapshot the registry into a local name -> pattern dict
+    predict_fn = _resolve_predict_fn(predictor)
+    patterns_by_name = {pattern.name: pattern for pattern in get_pattern_registry().get_all_patterns()}
+    get_pattern = patterns_by_name.get
+    
+    # Sort history once so each match's cutoff is a binary search
+    pdata = predictor.data.sort_values('Date', kind='stable').reset_index(drop=True)
+    pdates = pdata['Date'].to_numpy()
     
-    # Test each match
-    for idx, match in test_matches.iterrows():
+    # Test each match (dict rows: pattern functions use row['FTHG'] access)
+    for match in test_matches.to_dict('records'):
         # Get historical data up to (but not including) this match
-        historical = predictor.data[predictor.data['Date'] < match['Date']]
+        cutoff_idx = np.searchsorted(pdates, np.datetime64(match['Date']), side='left')
         
-        if len(historical) < 30:
+        if cutoff_idx < 30:
             continue
         
-        try:
-            # Get prediction
-            prediction = None
-            
-            # Try different predictor interfaces
-            if hasattr(predictor, 'predict_match') and 'historical_data' not in predictor.predict_match.__code__.co_varnames:
-                prediction = predictor.predict_match(
-                    home_team=match['HomeTeam'],
-                    away_team=match['AwayTeam'],
-                    match_date=historical['Date'].max()
-                )
-            elif hasattr(predictor, 'predict_match_simple'):
-                # Update predictor's data temporarily
-                old_data = predictor.data
-                predictor.data = historical
-                prediction = predictor.predict_match_simple(
-                    home_team=match['HomeTeam'],
-                    away_team=match['AwayTeam'],
-                    match_date=historical['Date'].max()
-                )
-                predictor.data = old_data
-            elif hasattr(predictor, 'predict_match'):
-                prediction = predictor.predict_match(
-                    home_team=match['HomeTeam'],
-                    away_team=match['AwayTeam'],
-                    historical_data=historical,
-                    match_date=historical['Date'].max()
-                )
-            
-            if not prediction:
+        historical = pdata.iloc[:cutoff_idx]
+        last_date = pdata['Date'].iat[cutoff_idx - 1]
+        
+        # Get prediction
+        prediction = None
+        if predict_fn:
+            try:
+                prediction = predict_fn(match['HomeTeam'], match['AwayTeam'], historical, last_date)
+            except MATCH_ERRORS:
                 continue
-            
-            # Extract prediction details
+        
+        if not prediction:
+            continue
+        
+        # Extract prediction details
+        if isinstance(prediction, dict):
+            # Handle dict returns (La Liga)
+            risk_adj = prediction.get('risk_adjusted_confidence')
+            threshold = prediction.get('threshold')
+            pattern_name = prediction.get('pattern_name')
+        else:
             risk_adj = getattr(prediction, 'risk_adjusted_confidence', None)
             threshold = getattr(prediction, 'threshold', None)
             pattern_name = getattr(prediction, 'pattern_name', None)
-            
-            # Handle dict returns (La Liga)
-            if isinstance(prediction, dict):
-                risk_adj = prediction.get('risk_adjusted_confidence')
-                threshold = prediction.get('threshold')
-                pattern_name = prediction.get('pattern_name')
-            
-            if not risk_adj or not threshold or not pattern_name:
-                continue
-            
-            if risk_adj < threshold:
-                continue
-            
-            # Check if prediction was correct
-            from patterns.registry import get_pattern_registry
-            registry = get_pattern_registry()
-            pattern = registry.get_pattern(pattern_name)
-            
-            if pattern:
-                actual_result = pattern.label_fn(match)
-                is_correct = actual_result == True
-                
-                predictions.append({
-                    'date': match['Date'],
-                    'home': match['HomeTeam'],
-                    'away': match['AwayTeam'],
-                    'pattern': pattern_name,
-                    'confidence': risk_adj,
-                    'correct': is_correct
-                })
-                
-                total += 1
-                by_pattern[pattern_name]['total'] += 1
-                
-                if is_correct:
-                    correct += 1
-                    by_pattern[pattern_name]['correct'] += 1
         
-        except Exception as e:
+        if not risk_adj or not threshold or not pattern_name:
+            continue
+        
+        if risk_adj < threshold:
+            continue
+        
+        # Check if prediction was correct
+        pattern = get_pattern(pattern_name)
+        if not pattern:
             continue
+        
+        try:
+            actual_result = pattern.label_fn(match)
+        except MATCH_ERRORS:
+            continue
+        is_correct = actual_result == True
+        
+        predictions[total] = {
+            'date': match['Date'],
+            'home': match['HomeTeam'],
+            'away': match['AwayTeam'],
+            'pattern': pattern_name,
+            'confidence': risk_adj,
+            'correct': is_correct
+        }
+        
+        total += 1
+        total_by_pattern[pattern_name] += 1
+        
+        if is_correct:
+            correct += 1
+            correct_by_pattern[pattern_name] += 1
+    
+    del predictions[total:]
     
     # Calculate results
     if total == 0:
@@ -161,22 +209,70 @@ def backtest_league(league_name, predictor, all_data, days=14):
     print(f"   Win Rate: {win_rate:.1f}%")
     
     # Pattern breakdown
-    if by_pattern:
+    if total_by_pattern:
         print(f"\n🎯 BY PATTERN:")
-        for pattern, stats in sorted(by_pattern.items(), key=lambda x: -x[1]['total']):
-            pattern_wr = (stats['correct'] / stats['total']) * 100 if stats['total'] > 0 else 0
-            print(f"   {pattern:35} {stats['correct']:3}/{stats['total']:3} = {pattern_wr:5.1f}%")
+        for pattern, pattern_total in total_by_pattern.most_common():
+            pattern_correct = correct_by_pattern[pattern]
+            pattern_wr = (pattern_correct / pattern_total) * 100
+            print(f"   {pattern:35} {pattern_correct:3}/{pattern_total:3} = {pattern_wr:5.1f}%")
     
     return {
         'league': league_name,
         'total': total,
         'correct': correct,
         'win_rate': win_rate,
-        'by_pattern': dict(by_pattern),
+        'correct_by_pattern': correct_by_pattern,
+        'total_by_pattern': total_by_pattern,
         'predictions': predictions
     }
 
 
+def run_one_league(league_config):
+    """
+    Load and backtest one league.
+    
+    Top-level so it can run in a worker process; the league's console
+    output is captured and returned so reports don't interleave.
+    
+    Returns:
+        Tuple of (report text, result dict or None)
+    """
+    report = io.StringIO()
+    result = None
+    
+    with redirect_stdout(report):
+        try:
+            print(f"\n📥 Loading {league_config['emoji']} {league_config['name']}...")
+            
+            # Load all data (including recent) on a thread while the predictor
+            # loads its own history; both are dominated by CSV parsing
+            with ThreadPoolExecutor(max_workers=1) as loader:
+                data_future = loader.submit(league_config['adapter_func'], include_future=False)
+                
+                # Initialize predictor
+                predictor = league_config['predictor_class']()
+                
+                all_data = data_future.result()
+            
+            # Run backtest
+            result = backtest_league(
+                f"{league_config['emoji']} {league_config['name']}", 
+                predictor, 
+                all_data,
+                days=14
+            )
+            
+            if result:
+                result['expected_wr'] = league_config['backtest_wr']
+        
+        except Exception as e:
+            print(f"❌ Error testing {league_config['name']}: {e}")
+            traceback.print_exc()
+            result = None
+    
+    return report.getvalue(), result
+
+
 def main():
     """Run backtest on all leagues"""
     
@@ -227,33 +323,14 @@ def main():
     
     all_results = []
     
-    # Test each league
-    for league_config in leagues:
-        try:
-            # Initialize predictor
-            print(f"\n📥 Loading {league_config['emoji']} {league_config['name']}...")
-            predictor = league_config['predictor_class']()
-            
-            # Load all data (including recent)
-            all_data = league_config['adapter_func'](include_future=False)
-            
-            # Run backtest
-            result = backtest_league(
-                f"{league_config['emoji']} {league_config['name']}", 
-                predictor, 
-                all_data,
-                days=14
-            )
-            
+    # Leagues are independent and CPU-bound, so test them in parallel and
+    # print each league's report in the original order
+    workers = min(len(leagues), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for report, result in executor.map(run_one_league, leagues):
+            print(report, end='')
             if result:
-                result['expected_wr'] = league_config['backtest_wr']
                 all_results.append(result)
-        
-        except Exception as e:
-            print(f"❌ Error testing {league_config['name']}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
     
     # Consolidated results
     print("\n" + "="*100)
@@ -284,21 +361,20 @@ def main():
     
     # Pattern analysis across all leagues
     print(f"\n🎯 TOP PATTERNS (Across All Leagues):")
-    all_patterns = defaultdict(lambda: {'correct': 0, 'total': 0})
+    all_correct = Counter()
+    all_total = Counter()
     
     for result in all_results:
-        for pattern, stats in result['by_pattern'].items():
-            all_patterns[pattern]['correct'] += stats['correct']
-            all_patterns[pattern]['total'] += stats['total']
-    
-    # Sort by total predictions
-    sorted_patterns = sorted(all_patterns.items(), key=lambda x: -x[1]['total'])[:15]
+        all_correct.update(result['correct_by_pattern'])
+        all_total.update(result['total_by_pattern'])
     
     print(f"{'Pattern':<35} {'Correct':<8} {'Total':<8} {'Win Rate':<10}")
     print("-"*100)
-    for pattern, stats in sorted_patterns:
-        pattern_wr = (stats['correct'] / stats['total']) * 100 if stats['total'] > 0 else 0
-        print(f"{pattern:<35} {stats['correct']:<8} {stats['total']:<8} {pattern_wr:<9.1f}%")
+    # Sorted by total predictions
+    for pattern, pattern_total in all_total.most_common(15):
+        pattern_correct = all_correct[pattern]
+        pattern_wr = (pattern_correct / pattern_total) * 100
+        print(f"{pattern:<35} {pattern_correct:<8} {pattern_total:<8} {pattern_wr:<9.1f}%")
     
     # Analysis
     print(f"\n" + "="*100)
@@ -334,27 +410,34 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_file = f"backtest_14days_{timestamp}.txt"
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("="*100 + "\n")
-        f.write("🎯 14-DAY BACKTEST RESULTS\n")
-        f.write("="*100 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Overall Win Rate: {overall_wr:.1f}%\n")
-        f.write(f"Total Predictions: {total_preds}\n")
-        f.write(f"Correct: {total_correct}\n")
-        f.write("="*100 + "\n\n")
+    # Build the report in memory and write it in one call
+    buf = io.StringIO()
+    buf.write("="*100 + "\n")
+    buf.write("🎯 14-DAY BACKTEST RESULTS\n")
+    buf.write("="*100 + "\n")
+    buf.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    buf.write(f"Overall Win Rate: {overall_wr:.1f}%\n")
+    buf.write(f"Total Predictions: {total_preds}\n")
+    buf.write(f"Correct: {total_correct}\n")
+    buf.write("="*100 + "\n\n")
+    
+    for result in all_results:
+        buf.write(f"\n{result['league']}\n")
+        buf.write("-"*100 + "\n")
+        buf.write(f"Win Rate: {result['win_rate']:.1f}% (Expected: {result['expected_wr']:.1f}%)\n")
+        buf.write(f"Predictions: {result['correct']}/{result['total']}\n\n")
         
-        for result in all_results:
-            f.write(f"\n{result['league']}\n")
-            f.write("-"*100 + "\n")
-            f.write(f"Win Rate: {result['win_rate']:.1f}% (Expected: {result['expected_wr']:.1f}%)\n")
-            f.write(f"Predictions: {result['correct']}/{result['total']}\n\n")
-            
-            f.write("By Pattern:\n")
-            for pattern, stats in sorted(result['by_pattern'].items(), key=lambda x: -x[1]['total']):
-                pattern_wr = (stats['correct'] / stats['total']) * 100 if stats['total'] > 0 else 0
-                f.write(f"  {pattern:35} {stats['correct']:3}/{stats['total']:3} = {pattern_wr:5.1f}%\n")
-            f.write("\n")
+        buf.write("By Pattern:\n")
+        correct_by_pattern = result['correct_by_pattern']
+        buf.write("".join(
+            f"  {pattern:35} {correct_by_pattern[pattern]:3}/{pattern_total:3} = "
+            f"{correct_by_pattern[pattern] / pattern_total * 100:5.1f}%\n"
+            for pattern, pattern_total in result['total_by_pattern'].most_common()
+        ))
+        buf.write("\n")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(buf.getvalue())
     
     print(f"\n📄 Detailed results saved to: {output_file}")
 
@@ -4,8 +4,10 @@ Multi-Period Backtest for Bundesliga
 Tests across multiple lookback periods to find optimal settings
 """
 
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import sys
 from typing import Dict, List
@@ -15,14 +17,23 @@ sys.path.append('.')
 from simple_bundesliga_predictor import SimpleBundesligaPredictor
 from data.bundesliga_adapter import load_bundesliga_data
 from patterns.bundesliga_patterns import register_bundesliga_patterns
-from patterns.registry import clear_patterns, get_pattern_registry
+from patterns.registry import clear_patterns, evaluate_bets, get_pattern_registry
+from _backtest_core import history_ends, tally_bets
 
 
-def backtest_period(all_data: pd.DataFrame, lookback_days: int) -> Dict:
+# Top-patterns table cell formats (match the printed header widths)
+TOP_PATTERN_FORMATTERS = {
+    'Pattern': '{:40}'.format,
+    'Bets': '{:>6}'.format,
+    'Win%': '{:>6.1f}%'.format,
+    'Units': '{:>+8.1f}'.format,
+}
+
+
+def backtest_period(all_data: pd.DataFrame, lookback_days: int,
+                    predictor: SimpleBundesligaPredictor) -> Dict:
     """Backtest a specific lookback period"""
     
-    predictor = SimpleBundesligaPredictor()
-    
     # Use most recent data for testing
     cutoff_date = all_data['Date'].max() - timedelta(days=lookback_days)
     test_data = all_data[all_data['Date'] > cutoff_date]
@@ -36,61 +47,77 @@ def backtest_period(all_data: pd.DataFrame, lookback_days: int) -> Dict:
         'pattern_stats': {}
     }
     
-    for _, match in test_data.iterrows():
-        # Get historical data before this match
-        historical = all_data[all_data['Date'] < match['Date']].tail(500)
-        
-        if len(historical) < 50:
+    # Date-sorted history so all match cutoffs come from one binary search
+    if not all_data['Date'].is_monotonic_increasing:
+        all_data = all_data.sort_values('Date', kind='stable')
+    ends = history_ends(all_data['Date'].to_numpy(), test_data['Date'].to_numpy())
+    
+    label_fns = {p.name: p.label_fn for p in get_pattern_registry().get_all_patterns()}
+    
+    # Collect (test row, pattern) for every bet placed; outcomes are settled
+    # after the loop, one vectorized evaluation per pattern
+    bet_rows = []
+    bet_patterns = []
+    
+    for pos, (match, i) in enumerate(zip(test_data.itertuples(index=False, name='Match'), ends)):
+        # i matches precede this one; skip before slicing if too few
+        if i < 50:
             continue
         
+        # Get historical data before this match (last 500)
+        historical = all_data.iloc[max(0, i - 500):i]
+        
         results['total_matches'] += 1
         
         # Get predictions
         recommendations = predictor.predict_match(
-            match['HomeTeam'],
-            match['AwayTeam'],
+            match.HomeTeam,
+            match.AwayTeam,
             historical,
-            match['Date']
+            match.Date
         )
         
-        # Check each bet
         for rec in recommendations:
-            if rec.recommendation != "BET":
-                continue
-            
-            # Verify pattern outcome
-            pattern = get_pattern_registry().get_pattern(rec.pattern_name)
-            if not pattern:
+            if rec.recommendation != "BET" or rec.pattern_name not in label_fns:
                 continue
-            
-            outcome = pattern.label_fn(match)
-            
-            # Track pattern stats
-            if rec.pattern_name not in results['pattern_stats']:
-                results['pattern_stats'][rec.pattern_name] = {
-                    'bets': 0, 'wins': 0, 'losses': 0, 'units': 0.0
-                }
-            
-            results['total_bets'] += 1
-            results['pattern_stats'][rec.pattern_name]['bets'] += 1
-            
-            if outcome:
-                results['wins'] += 1
-                results['pattern_stats'][rec.pattern_name]['wins'] += 1
-                # Estimate profit (using estimated odds - 1)
-                estimated_odds = predictor._estimate_odds(rec.pattern_name)
-                profit = estimated_odds - 1
-                results['units'] += profit
-                results['pattern_stats'][rec.pattern_name]['units'] += profit
-            else:
-                results['losses'] += 1
-                results['pattern_stats'][rec.pattern_name]['losses'] += 1
-                results['units'] -= 1.0
-                results['pattern_stats'][rec.pattern_name]['units'] -= 1.0
+            bet_rows.append(pos)
+            bet_patterns.append(rec.pattern_name)
+    
+    # Verify pattern outcomes
+    outcomes = evaluate_bets(label_fns, test_data, bet_rows, bet_patterns)
+    
+    # Estimate profit (using estimated odds - 1) for wins, lose the stake otherwise
+    odds = np.array([predictor._estimate_odds(name) for name in bet_patterns], dtype=np.float64)
+    profits = np.where(outcomes, odds - 1, -1.0)
+    
+    results['total_bets'] = len(bet_patterns)
+    results['wins'] = int(outcomes.sum())
+    results['losses'] = results['total_bets'] - results['wins']
+    results['units'] = float(profits.sum())
+    results['pattern_stats'] = tally_bets(bet_patterns, outcomes, profits)
     
     return results
 
 
+# Per-process state for the period sweep, set once by _init_worker
+_worker_data = None
+_worker_predictor = None
+
+
+def _init_worker(all_data: pd.DataFrame, predictor: SimpleBundesligaPredictor):
+    """Receive the shared data/predictor once per worker and register patterns"""
+    global _worker_data, _worker_predictor
+    _worker_data = all_data
+    _worker_predictor = predictor
+    clear_patterns()
+    register_bundesliga_patterns()
+
+
+def _run_period(lookback_days: int) -> Dict:
+    """Backtest one lookback period in a worker process"""
+    return backtest_period(_worker_data, lookback_days, _worker_predictor)
+
+
 def main():
     """Run multi-period backtest"""
     
@@ -103,7 +130,8 @@ def main():
     # Load data
     print("Loading Bundesliga data...")
     all_data = load_bundesliga_data()
-    all_data = all_data[(all_data['HC'] >= 0) & (all_data['AC'] >= 0)]
+    # One comparison over the corner columns' block instead of two masks and an AND
+    all_data = all_data[(all_data[['HC', 'AC']].to_numpy() >= 0).all(axis=1)]
     print(f"Loaded {len(all_data)} matches")
     print(f"Date range: {all_data['Date'].min().date()} to {all_data['Date'].max().date()}")
     print()
@@ -115,12 +143,18 @@ def main():
     # Test periods (requested by user)
     test_periods = [7, 10, 14, 30, 45, 60, 90, 120, 160]
     
-    all_results = {}
+    # Periods are independent, so run them in worker processes. The data and
+    # predictor are sent once per worker; each worker's predictor keeps its
+    # per-date caches across the periods it runs
+    predictor = SimpleBundesligaPredictor()
+    workers = min(len(test_periods), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(all_data, predictor)) as executor:
+        all_results = dict(zip(test_periods, executor.map(_run_period, test_periods)))
     
     for days in test_periods:
         print(f"\nTesting {days}-day lookback period...")
-        results = backtest_period(all_data, days)
-        all_results[days] = results
+        results = all_results[days]
         
         if results['total_bets'] > 0:
             win_rate = results['wins'] / results['total_bets'] * 100
@@ -171,22 +205,24 @@ def main():
     print("="*80)
     
     if 90 in all_results and all_results[90]['pattern_stats']:
-        pattern_stats = all_results[90]['pattern_stats']
+        # Top 15 by units, showing those with at least 3 bets
+        top_patterns = pd.DataFrame.from_dict(
+            all_results[90]['pattern_stats'], orient='index'
+        ).nlargest(15, 'units')
+        top_patterns = top_patterns[top_patterns['bets'] >= 3]
         
-        # Sort by units
-        sorted_patterns = sorted(
-            pattern_stats.items(),
-            key=lambda x: x[1]['units'],
-            reverse=True
-        )
+        table = pd.DataFrame({
+            'Pattern': top_patterns.index,
+            'Bets': top_patterns['bets'].to_numpy(),
+            'Win%': (top_patterns['wins'] / top_patterns['bets'] * 100).to_numpy(),
+            'Units': top_patterns['units'].to_numpy(),
+        })
         
         print(f"{'Pattern':40} {'Bets':>6} {'Win%':>7} {'Units':>8}")
         print("-"*80)
         
-        for pattern_name, stats in sorted_patterns[:15]:
-            if stats['bets'] >= 3:
-                win_rate = stats['wins'] / stats['bets'] * 100
-                print(f"{pattern_name:40} {stats['bets']:>6} {win_rate:>6.1f}% {stats['units']:>+8.1f}")
+        if not table.empty:
+            print(table.to_string(index=False, header=False, formatters=TOP_PATTERN_FORMATTERS))
     
     print("\n" + "="*80)
     print("BUNDESLIGA BACKTEST COMPLETE")
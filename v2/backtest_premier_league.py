@@ -3,10 +3,17 @@ Premier League Multi-Period Backtesting
 Tests predictor across different lookback periods to validate robustness.
 """
 
+import io
+import os
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
+from functools import partial
+from typing import Dict, Optional, Tuple
 from simple_premier_league_predictor import SimplePremierLeaguePredictor
 from data.premier_league_adapter import load_premier_league_data
+from patterns.registry import evaluate_bets
 
 
 def backtest_period(predictor, start_date, end_date, period_name):
@@ -14,34 +21,36 @@ def backtest_period(predictor, start_date, end_date, period_name):
     test_df = predictor.df[
         (predictor.df['date'] >= start_date) & 
         (predictor.df['date'] <= end_date)
-    ].copy()
-    
-    total_predictions = 0
-    correct_predictions = 0
-    total_profit = 0.0
+    ]
     
     print(f"\nBacktesting {period_name}: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
     print(f"Test matches: {len(test_df)}")
     
-    for _, match in test_df.iterrows():
+    # Collect (test row, pattern) for every prediction; outcomes are settled
+    # after the loop, one vectorized evaluation per pattern
+    pred_rows = []
+    pred_patterns = []
+    
+    for pos, match in enumerate(test_df.itertuples(index=False, name='Match')):
         predictions = predictor.predict_match(
-            match['home_team'],
-            match['away_team'],
-            match['date'],
+            match.home_team,
+            match.away_team,
+            match.date,
             verbose=False
         )
         
-        # Test each prediction
         for pred in predictions:
-            pattern_func = predictor.filtered_patterns[pred['pattern']]['func']
-            actual_result = pattern_func(match)
-            
-            total_predictions += 1
-            if actual_result:
-                correct_predictions += 1
-                total_profit += 1.0  # Assuming 2.0 odds (profit = 1.0)
-            else:
-                total_profit -= 1.0  # Lost stake
+            pred_rows.append(pos)
+            pred_patterns.append(pred['pattern'])
+    
+    # Test each prediction
+    label_fns = {name: pattern['func'] for name, pattern in predictor.filtered_patterns.items()}
+    outcomes = evaluate_bets(label_fns, test_df, pred_rows, pred_patterns)
+    
+    total_predictions = len(outcomes)
+    correct_predictions = int(outcomes.sum())
+    # Assuming 2.0 odds: +1.0 profit per win, -1.0 lost stake per loss
+    total_profit = float(correct_predictions - (total_predictions - correct_predictions))
     
     win_rate = (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0
     
@@ -59,6 +68,38 @@ def backtest_period(predictor, start_date, end_date, period_name):
     }
 
 
+def run_period(config: Tuple[int, str], latest_date, earliest_date) -> Tuple[str, Optional[Dict]]:
+    """
+    Build a predictor for one lookback period and backtest it.
+    
+    Top-level so it can run in a worker process; the period's console
+    output is captured and returned so reports don't interleave.
+    
+    Returns:
+        Tuple of (report text, result dict or None if skipped)
+    """
+    lookback_days, period_name = config
+    report = io.StringIO()
+    result = None
+    
+    with redirect_stdout(report):
+        # Create predictor with specific lookback
+        predictor = SimplePremierLeaguePredictor(lookback_days=lookback_days)
+        
+        # Test on last 30 days of data
+        end_date = latest_date
+        start_date = end_date - timedelta(days=30)
+        
+        # Make sure we have enough historical data
+        min_date_required = start_date - timedelta(days=lookback_days)
+        if min_date_required < earliest_date:
+            print(f"\nSkipping {period_name}: insufficient historical data")
+        else:
+            result = backtest_period(predictor, start_date, end_date, period_name)
+    
+    return report.getvalue(), result
+
+
 def main():
     """Run multi-period backtesting on Premier League."""
     print("="*80)
@@ -66,7 +107,6 @@ def main():
     print("="*80)
     
     df = load_premier_league_data()
-    latest_date = df['date'].max()
     
     # Test periods: 7, 10, 14, 30, 45, 60, 90, 120, 160 days lookback
     test_configs = [
@@ -83,22 +123,15 @@ def main():
     
     results = []
     
-    for lookback_days, period_name in test_configs:
-        # Create predictor with specific lookback
-        predictor = SimplePremierLeaguePredictor(lookback_days=lookback_days)
-        
-        # Test on last 30 days of data
-        end_date = latest_date
-        start_date = end_date - timedelta(days=30)
-        
-        # Make sure we have enough historical data
-        min_date_required = start_date - timedelta(days=lookback_days)
-        if min_date_required < df['date'].min():
-            print(f"\nSkipping {period_name}: insufficient historical data")
-            continue
-        
-        result = backtest_period(predictor, start_date, end_date, period_name)
-        results.append(result)
+    # Each period builds its own predictor and is independent of the others,
+    # so run them in parallel and print the reports in the original order
+    run = partial(run_period, latest_date=df['date'].max(), earliest_date=df['date'].min())
+    workers = min(len(test_configs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for report, result in executor.map(run, test_configs):
+            print(report, end='')
+            if result:
+                results.append(result)
     
     # Summary
     print("\n" + "="*80)
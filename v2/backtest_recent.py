@@ -16,111 +16,104 @@ from typing import List, Dict, Tuple
 # Add v2 to path
 sys.path.append('.')
 
-from simple_predict_range import SimpleRomanianPredictor, SimpleBettingRecommendation
+from simple_predict_range import SimpleRomanianPredictor
+from data.cache import cached_frame
+from _backtest_core import history_ends, tally_bets
+
+
+# Source CSV column -> standard column name
+ROMANIAN_COLUMNS = {
+    'home_team_name': 'HomeTeam',
+    'away_team_name': 'AwayTeam',
+    'home_team_goal_count': 'FTHG',
+    'away_team_goal_count': 'FTAG',
+    'home_team_corner_count': 'HC',
+    'away_team_corner_count': 'AC',
+    'home_team_yellow_cards': 'HY',
+    'away_team_yellow_cards': 'AY',
+    'date_GMT': 'Date',
+    'status': 'Status',
+    'timestamp': 'Timestamp',
+}
 
 
 def load_romanian_data() -> pd.DataFrame:
-    """Load and process Romanian Liga I data"""
+    """Load and process Romanian Liga I data (cached until a CSV or this script changes)"""
     csv_files = glob.glob('data/liga1-romania/*.csv')
-    data_frames = []
+    return cached_frame('liga1-romania-backtest', csv_files + [__file__],
+                        lambda: _read_romanian_csvs(csv_files))
+
+
+def _read_romanian_csvs(csv_files: List[str]) -> pd.DataFrame:
+    """Read the season CSVs into one frame in standard format"""
+    # Read only the mapped columns and concatenate once
+    combined_data = pd.concat(
+        (pd.read_csv(file, usecols=list(ROMANIAN_COLUMNS)) for file in csv_files),
+        ignore_index=True
+    ).rename(columns=ROMANIAN_COLUMNS)[list(ROMANIAN_COLUMNS.values())]
     
-    for file in csv_files:
-        df = pd.read_csv(file)
-        
-        # Map to standard format
-        df_mapped = pd.DataFrame({
-            'HomeTeam': df['home_team_name'],
-            'AwayTeam': df['away_team_name'],
-            'FTHG': df['home_team_goal_count'],
-            'FTAG': df['away_team_goal_count'],
-            'HC': df['home_team_corner_count'],
-            'AC': df['away_team_corner_count'],
-            'HY': df['home_team_yellow_cards'],
-            'AY': df['away_team_yellow_cards'],
-            'Date': df['date_GMT'],
-            'Status': df['status'],
-            'Timestamp': df['timestamp']
-        })
-        
-        # Add result for completed matches
-        def get_result(row):
-            if pd.isna(row['FTHG']) or pd.isna(row['FTAG']):
-                return None
-            return 'H' if row['FTHG'] > row['FTAG'] else ('A' if row['FTAG'] > row['FTHG'] else 'D')
-        
-        df_mapped['FTR'] = df_mapped.apply(get_result, axis=1)
-        data_frames.append(df_mapped)
+    # Add result for completed matches
+    home_goals = combined_data['FTHG'].to_numpy()
+    away_goals = combined_data['FTAG'].to_numpy()
+    result = np.select([home_goals > away_goals, away_goals > home_goals], ['H', 'A'], default='D')
+    played = (combined_data['FTHG'].notna() & combined_data['FTAG'].notna()).to_numpy()
+    combined_data['FTR'] = np.where(played, result, None)
     
-    combined_data = pd.concat(data_frames, ignore_index=True)
     combined_data = combined_data.dropna(subset=['HomeTeam', 'AwayTeam'])
+    # Categories are only shared after concat, so convert team names here
+    combined_data[['HomeTeam', 'AwayTeam']] = combined_data[['HomeTeam', 'AwayTeam']].astype('category')
     combined_data['DateTime'] = pd.to_datetime(combined_data['Timestamp'], unit='s')
     
-    return combined_data
+    # Chronological order, so every filtered slice downstream is already sorted
+    return combined_data.sort_values('DateTime', kind='stable').reset_index(drop=True)
 
 
-def check_bet_result(bet: SimpleBettingRecommendation, actual_match: pd.Series) -> Tuple[bool, str]:
-    """Check if a bet would have won based on actual match results"""
+def score_bets(bet_matches: pd.DataFrame, patterns: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Check bets against actual match results in one pass.
     
-    home_goals = actual_match['FTHG']
-    away_goals = actual_match['FTAG']
-    home_corners = actual_match['HC'] if not pd.isna(actual_match['HC']) else 0
-    away_corners = actual_match['AC'] if not pd.isna(actual_match['AC']) else 0
-    home_cards = actual_match['HY'] if not pd.isna(actual_match['HY']) else 0
-    away_cards = actual_match['AY'] if not pd.isna(actual_match['AY']) else 0
+    bet_matches holds the match row of each bet (one row per bet, in order)
+    and patterns the pattern bet on. Returns per-bet (won, result_detail).
+    """
     
-    pattern = bet.pattern_name
+    home_goals = bet_matches['FTHG'].to_numpy()
+    away_goals = bet_matches['FTAG'].to_numpy()
+    home_corners = bet_matches['HC'].fillna(0).to_numpy()
+    away_corners = bet_matches['AC'].fillna(0).to_numpy()
+    home_cards = bet_matches['HY'].fillna(0).to_numpy()
     
-    # Check pattern results
-    if pattern == 'total_over_8_5_corners':
-        total_corners = home_corners + away_corners
-        won = total_corners > 8.5
-        result_detail = f"Total corners: {total_corners} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'total_over_9_5_corners':
-        total_corners = home_corners + away_corners
-        won = total_corners > 9.5
-        result_detail = f"Total corners: {total_corners} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'total_over_7_5_corners':
-        total_corners = home_corners + away_corners
-        won = total_corners > 7.5
-        result_detail = f"Total corners: {total_corners} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'total_over_10_5_corners':
-        total_corners = home_corners + away_corners
-        won = total_corners > 10.5
-        result_detail = f"Total corners: {total_corners} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'home_over_0_5_goals':
-        won = home_goals > 0.5
-        result_detail = f"Home goals: {home_goals} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'away_over_1_5_goals':
-        won = away_goals > 1.5
-        result_detail = f"Away goals: {away_goals} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'both_teams_to_score':
-        won = home_goals > 0 and away_goals > 0
-        result_detail = f"Goals: {home_goals}-{away_goals} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'total_over_3_5_goals':
-        total_goals = home_goals + away_goals
-        won = total_goals > 3.5
-        result_detail = f"Total goals: {total_goals} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    elif pattern == 'home_over_1_5_cards':
-        won = home_cards > 1.5
-        result_detail = f"Home cards: {home_cards} ({'✅ WIN' if won else '❌ LOSS'})"
-        
-    else:
-        won = False
-        result_detail = "Pattern not implemented for backtest"
+    total_corners = home_corners + away_corners
+    total_goals = home_goals + away_goals
+    score_line = [f"{h}-{a}" for h, a in zip(home_goals, away_goals)]
+    
+    # pattern -> (detail label, shown value, won)
+    checks = {
+        'total_over_8_5_corners': ('Total corners', total_corners, total_corners > 8.5),
+        'total_over_9_5_corners': ('Total corners', total_corners, total_corners > 9.5),
+        'total_over_7_5_corners': ('Total corners', total_corners, total_corners > 7.5),
+        'total_over_10_5_corners': ('Total corners', total_corners, total_corners > 10.5),
+        'home_over_0_5_goals': ('Home goals', home_goals, home_goals > 0.5),
+        'away_over_1_5_goals': ('Away goals', away_goals, away_goals > 1.5),
+        'both_teams_to_score': ('Goals', score_line, (home_goals > 0) & (away_goals > 0)),
+        'total_over_3_5_goals': ('Total goals', total_goals, total_goals > 3.5),
+        'home_over_1_5_cards': ('Home cards', home_cards, home_cards > 1.5),
+    }
+    
+    patterns = np.asarray(patterns, dtype=object)
+    won = np.zeros(len(patterns), dtype=bool)
+    details = ["Pattern not implemented for backtest"] * len(patterns)
+    
+    for pattern, (label, values, hits) in checks.items():
+        idx = np.flatnonzero(patterns == pattern)
+        won[idx] = hits[idx]
+        for i in idx:
+            details[i] = f"{label}: {values[i]} ({'✅ WIN' if won[i] else '❌ LOSS'})"
     
-    return won, result_detail
+    return won, details
 
 
-def run_backtest(days_back: int = 10):
-    """Run backtest on last N days of completed matches"""
+def run_backtest(days_back: int = 10, quiet: bool = False):
+    """Run backtest on last N days of completed matches (quiet: summary only)"""
     
     print(f"🔍 ROMANIAN LIGA I BACKTEST")
     print(f"📅 Testing last {days_back} days of completed matches")
@@ -128,7 +121,7 @@ def run_backtest(days_back: int = 10):
     
     # Load all data
     all_data = load_romanian_data()
-    completed_matches = all_data[all_data['Status'] == 'complete'].copy()
+    completed_matches = all_data[all_data['Status'] == 'complete']
     
     if len(completed_matches) == 0:
         print("❌ No completed matches found")
@@ -144,7 +137,7 @@ def run_backtest(days_back: int = 10):
     # Get matches in backtest period
     backtest_matches = completed_matches[
         completed_matches['DateTime'] >= start_date
-    ].copy().sort_values('DateTime')
+    ]
     
     print(f"🎯 Found {len(backtest_matches)} matches to backtest")
     print()
@@ -159,38 +152,66 @@ def run_backtest(days_back: int = 10):
     total_stake = 0
     total_return = 0
     
-    print("📋 BACKTEST RESULTS - ALL MATCHES")
-    print("=" * 45)
+    # Pick each match's bet first, then check all picks against the results
+    # in one pass before reporting
+    picks = []  # (match, historical count, recommendations, picked bet)
+    pick_rows = []
+    pick_patterns = []
     
-    # Process each match
-    match_counter = 0
-    for idx, match in backtest_matches.iterrows():
-        match_counter += 1
+    ends = history_ends(completed_matches['DateTime'].to_numpy(), backtest_matches['DateTime'].to_numpy())
+    
+    for pos, (match, i) in enumerate(zip(backtest_matches.itertuples(index=False, name='Match'), ends)):
+        if i < 20:  # Need sufficient historical data (i matches precede this one)
+            picks.append((match, int(i), None, None))
+            continue
         
         # Get historical data (everything before this match)
-        historical_data = completed_matches[completed_matches['DateTime'] < match['DateTime']].copy()
-        
-        # Display match header
-        print(f"\n{match_counter}. {match['DateTime'].strftime('%m-%d %H:%M')} - {match['HomeTeam']} vs {match['AwayTeam']}")
-        print(f"   📊 Actual Result: {int(match['FTHG'])}-{int(match['FTAG'])} (Corners: {int(match['HC'])}-{int(match['AC'])})")
-        
-        if len(historical_data) < 20:  # Need sufficient historical data
-            print(f"   ⚠️ INSUFFICIENT DATA: Only {len(historical_data)} historical matches")
-            continue
+        historical_data = completed_matches.iloc[:i]
         
         # Get predictions for this match
         recommendations = predictor.predict_match(
-            match['HomeTeam'], match['AwayTeam'], historical_data
+            match.HomeTeam, match.AwayTeam, historical_data
         )
         
-        # Find best bet recommendation
+        # Find best bet recommendation, or the best pattern that didn't qualify
         bet_recs = [r for r in recommendations if r.recommendation == "BET"]
-        
         if bet_recs:
-            best_bet = max(bet_recs, key=lambda x: x.expected_value)
-            
-            # Check actual result
-            won, result_detail = check_bet_result(best_bet, match)
+            ev = np.fromiter((r.expected_value for r in bet_recs), dtype=np.float64, count=len(bet_recs))
+            picked = bet_recs[int(ev.argmax())]
+        elif recommendations:
+            conf = np.fromiter((r.confidence for r in recommendations), dtype=np.float64, count=len(recommendations))
+            picked = recommendations[int(conf.argmax())]
+        else:
+            picked = None
+        
+        picks.append((match, len(historical_data), recommendations, picked))
+        if picked is not None:
+            pick_rows.append(pos)
+            pick_patterns.append(picked.pattern_name)
+    
+    pick_won, pick_details = score_bets(backtest_matches.iloc[pick_rows], pick_patterns)
+    
+    # Per-match report lines (skipped when quiet), written in one go after the loop
+    lines = ["📋 BACKTEST RESULTS - ALL MATCHES", "=" * 45]
+    
+    scored = 0
+    for match_counter, (match, n_historical, recommendations, picked) in enumerate(picks, 1):
+        if not quiet:
+            # Display match header
+            lines.append(f"\n{match_counter}. {match.DateTime.strftime('%m-%d %H:%M')} - {match.HomeTeam} vs {match.AwayTeam}")
+            lines.append(f"   📊 Actual Result: {int(match.FTHG)}-{int(match.FTAG)} (Corners: {int(match.HC)}-{int(match.AC)})")
+        
+        if recommendations is None:
+            if not quiet:
+                lines.append(f"   ⚠️ INSUFFICIENT DATA: Only {n_historical} historical matches")
+            continue
+        
+        if picked is not None:
+            won, result_detail = bool(pick_won[scored]), pick_details[scored]
+            scored += 1
+        
+        if picked is not None and picked.recommendation == "BET":
+            best_bet = picked
             
             # Calculate returns (assuming 1 unit stake)
             stake = 1.0
@@ -200,8 +221,8 @@ def run_backtest(days_back: int = 10):
             
             # Track statistics
             all_bets.append({
-                'match': f"{match['HomeTeam']} vs {match['AwayTeam']}",
-                'date': match['DateTime'].strftime('%Y-%m-%d'),
+                'match': f"{match.HomeTeam} vs {match.AwayTeam}",
+                'date': match.DateTime.strftime('%Y-%m-%d'),
                 'bet': best_bet,
                 'won': won,
                 'stake': stake,
@@ -218,30 +239,35 @@ def run_backtest(days_back: int = 10):
             else:
                 losing_bets.append(best_bet)
             
+            if quiet:
+                continue
+            
             # Display result
             status = "🟢 BET & WIN" if won else "🔴 BET & LOSS"
-            print(f"   {status}")
-            print(f"   💰 Bet: {best_bet.bet_type}")
-            print(f"   📊 Confidence: {best_bet.confidence:.1%} (threshold: {best_bet.threshold:.1%})")
-            print(f"   🎯 {result_detail}")
-            print(f"   💵 Profit: {profit:+.2f} units")
+            lines.append(f"   {status}")
+            lines.append(f"   💰 Bet: {best_bet.bet_type}")
+            lines.append(f"   📊 Confidence: {best_bet.confidence:.1%} (threshold: {best_bet.threshold:.1%})")
+            lines.append(f"   🎯 {result_detail}")
+            lines.append(f"   💵 Profit: {profit:+.2f} units")
         
-        else:
+        elif not quiet:
             # NO BET case - show why
-            print(f"   ❌ NO BET: No patterns met confidence threshold")
+            lines.append(f"   ❌ NO BET: No patterns met confidence threshold")
             
             # Show best pattern that didn't qualify
-            if recommendations:
-                best_non_bet = max(recommendations, key=lambda x: x.confidence)
-                print(f"   � Best pattern: {best_non_bet.bet_type}")
-                print(f"   � Confidence: {best_non_bet.confidence:.1%} (needed: {best_non_bet.threshold:.1%})")
+            if picked is not None:
+                best_non_bet = picked
+                lines.append(f"   � Best pattern: {best_non_bet.bet_type}")
+                lines.append(f"   � Confidence: {best_non_bet.confidence:.1%} (needed: {best_non_bet.threshold:.1%})")
                 
                 # Show what would have happened if we bet anyway
-                hypothetical_won, hypothetical_result = check_bet_result(best_non_bet, match)
-                hypothetical_status = "would have WON" if hypothetical_won else "would have LOST"
-                print(f"   � Hypothetical: {hypothetical_result} - {hypothetical_status}")
+                hypothetical_status = "would have WON" if won else "would have LOST"
+                lines.append(f"   � Hypothetical: {result_detail} - {hypothetical_status}")
             else:
-                print(f"   ⚠️ No recommendations generated")
+                lines.append(f"   ⚠️ No recommendations generated")
+    
+    if not quiet:
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Calculate final statistics
     if all_bets:
@@ -270,19 +296,15 @@ def run_backtest(days_back: int = 10):
         
         # Pattern analysis
         print(f"\n🎨 PATTERN PERFORMANCE:")
-        pattern_stats = {}
-        for bet_data in all_bets:
-            pattern = bet_data['bet'].pattern_name
-            if pattern not in pattern_stats:
-                pattern_stats[pattern] = {'wins': 0, 'total': 0, 'profit': 0}
-            pattern_stats[pattern]['total'] += 1
-            pattern_stats[pattern]['profit'] += bet_data['profit']
-            if bet_data['won']:
-                pattern_stats[pattern]['wins'] += 1
+        pattern_stats = tally_bets(
+            [b['bet'].pattern_name for b in all_bets],
+            np.array([b['won'] for b in all_bets]),
+            np.array([b['profit'] for b in all_bets], dtype=np.float64)
+        )
         
         for pattern, stats in pattern_stats.items():
-            win_rate_pattern = stats['wins'] / stats['total']
-            print(f"   • {pattern}: {win_rate_pattern:.1%} win rate, {stats['profit']:+.1f} units profit")
+            win_rate_pattern = stats['wins'] / stats['bets']
+            print(f"   • {pattern}: {win_rate_pattern:.1%} win rate, {stats['units']:+.1f} units profit")
         
         print(f"\n🔮 VALIDATION:")
         if win_rate >= 0.67:  # Our target accuracy
@@ -304,9 +326,10 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description='Backtest Romanian Liga I predictions')
     parser.add_argument('--days', type=int, default=10, help='Days to backtest (default: 10)')
+    parser.add_argument('--quiet', action='store_true', help='Skip the per-match report, print the summary only')
     
     args = parser.parse_args()
-    run_backtest(args.days)
+    run_backtest(args.days, quiet=args.quiet)
 
 
 if __name__ == "__main__":
@@ -13,15 +13,337 @@ Features:
 - Consecutive loss tracking
 """
 
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from typing import Dict, Optional
+import atexit
 import json
+import os
+import struct
+import sys
+import tempfile
+import textwrap
+import time
+import weakref
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# JSON state by default; pass a .msgpack db_file to opt into MessagePack
+DEFAULT_DB_FILE = "bankroll.json"
+
+# Daily bet counters older than this (relative to the latest betting day) are dropped
+DAILY_BETS_RETENTION_DAYS = 30
+
+# Batch-mode managers still alive at interpreter exit, flushed by _flush_batch_managers
+_BATCH_MANAGERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_batch_managers():
+    """Persist any batch-mode bets that were never flushed"""
+    for manager in list(_BATCH_MANAGERS):
+        manager.flush()
+
+
+def _decode_state(path: Path) -> Dict:
+    """Read a state file, choosing MessagePack or JSON from its suffix."""
+    raw = path.read_bytes()
+    if path.suffix == '.msgpack':
+        return msgpack.unpackb(raw, raw=False)
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write data through a temp file and rename, so a crash never leaves a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _encode_state(path: Path, state: Dict):
+    """Write a state file, choosing MessagePack or JSON from its suffix."""
+    if path.suffix == '.msgpack':
+        data = msgpack.packb(state, use_bin_type=True)
+    elif orjson is not None:
+        data = orjson.dumps(state, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(state, indent=2).encode('utf-8')
+    _atomic_write(path, data)
+
+
+def _dumps_line(record) -> bytes:
+    """Encode one bet log record as a JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record).encode('utf-8') + b'\n'
+
+
+def _kelly_batch(
+    conf: np.ndarray,
+    odds: np.ndarray,
+    frac: float,
+    max_pct: float,
+    bankroll: float,
+    commission: float = 0.0
+) -> np.ndarray:
+    """Fractional Kelly stakes for arrays of win probabilities and decimal odds."""
+    b = (odds - 1) * (1 - commission)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kelly = (b * conf - (1 - conf)) / b
+    stake = np.minimum(kelly * frac * bankroll, max_pct * bankroll)
+    # No edge below 50% confidence or when a win pays nothing after commission
+    stake = np.where((conf <= 0.5) | (b <= 0), 0.0, stake)
+    return np.round(np.maximum(stake, 0.0), 2)
+
+
+# Numeric part of each bet in the binary bet file. Records are fixed-size, so
+# settling a bet rewrites it in place; BET_RECORD packs single records and
+# BET_RECORD_DTYPE reads the whole file back (same little-endian layout).
+BET_RECORD = struct.Struct('<ddddbdd')  # ts, stake, odds, confidence, result, profit, settled_at
+BET_RECORD_DTYPE = np.dtype([
+    ('ts', '<f8'),
+    ('stake', '<f8'),
+    ('odds', '<f8'),
+    ('confidence', '<f8'),
+    ('result', 'i1'),
+    ('profit', '<f8'),
+    ('settled_at', '<f8')
+])
+
+
+def _to_epoch(value) -> float:
+    """Epoch seconds from a stored timestamp (epoch float or legacy ISO string)."""
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return value
+
+
+def _fmt_ts(ts: float) -> Optional[str]:
+    """ISO display string for an epoch timestamp, None if unset."""
+    return None if np.isnan(ts) else datetime.fromtimestamp(ts).isoformat()
+
+
+class BetHistory(Sequence):
+    """
+    Bet history stored column-wise.
+    
+    Numeric fields (including epoch timestamps) live in preallocated NumPy
+    arrays (doubling on overflow) and text fields in parallel lists, so
+    aggregates over the whole history are single array operations. Indexing
+    returns the bet as a dict with ISO-formatted timestamps for display.
+    """
+    
+    PENDING = -1  # results code for an unsettled bet (0 = lost, 1 = won)
+    
+    def __init__(self, capacity: int = 1024):
+        self._n = 0
+        self.stakes = np.empty(capacity, dtype=np.float64)
+        self.odds = np.empty(capacity, dtype=np.float64)
+        self.confidences = np.empty(capacity, dtype=np.float64)
+        self.results = np.empty(capacity, dtype=np.int8)
+        self.profits = np.empty(capacity, dtype=np.float64)
+        self.placed_at = np.empty(capacity, dtype=np.float64)
+        self.settled_at = np.empty(capacity, dtype=np.float64)
+        # [date, match, pattern] per bet; rows loaded from disk stay None
+        # until first read and are parsed from _raw[_starts[i]:_ends[i]]
+        self._rows = []
+        self._raw = b''
+        self._starts = self._ends = None
+    
+    def _grow(self):
+        """Double the capacity of the numeric columns"""
+        for name in ('stakes', 'odds', 'confidences', 'results', 'profits', 'placed_at', 'settled_at'):
+            old = getattr(self, name)
+            new = np.empty(len(old) * 2, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+    
+    def append(self, bet: Dict):
+        """Add a bet record (pending or already settled)"""
+        i = self._n
+        if i == len(self.stakes):
+            self._grow()
+        self.stakes[i] = bet['stake']
+        self.odds[i] = bet['odds']
+        self.confidences[i] = bet['confidence']
+        result = bet.get('result')
+        self.results[i] = self.PENDING if result is None else int(bool(result))
+        self.profits[i] = np.nan if result is None else bet['profit']
+        self.placed_at[i] = _to_epoch(bet['ts'] if 'ts' in bet else bet.get('timestamp'))
+        self.settled_at[i] = _to_epoch(bet.get('settled_at'))
+        self._rows.append([bet.get('date'), bet.get('match'), bet.get('pattern')])
+        self._n = i + 1
+    
+    def settle(self, index: int, won: bool, profit: float, ts: float):
+        """Record the outcome of the bet at index, settled at epoch time ts"""
+        self.results[index] = int(bool(won))
+        self.profits[index] = profit
+        self.settled_at[index] = ts
+    
+    @classmethod
+    def from_records(cls, records: np.ndarray, text_lines: bytes) -> tuple:
+        """
+        Build a history from BET_RECORD_DTYPE records and the raw text file.
+        
+        Only the line boundaries of text_lines are located here; each
+        [date, match, pattern] row is parsed the first time it is read.
+        
+        Returns:
+            (history, records_size, texts_size): the history of the bets
+            present in both inputs, and the byte lengths of the records and
+            text lines it was built from
+        """
+        ends = np.flatnonzero(np.frombuffer(text_lines, dtype=np.uint8) == ord('\n'))
+        n = min(len(records), len(ends))  # a write cut short leaves one file longer
+        records = records[:n]
+        history = cls(capacity=max(1024, n))
+        history._n = n
+        history.stakes[:n] = records['stake']
+        history.odds[:n] = records['odds']
+        history.confidences[:n] = records['confidence']
+        history.results[:n] = records['result']
+        history.profits[:n] = records['profit']
+        history.placed_at[:n] = records['ts']
+        history.settled_at[:n] = records['settled_at']
+        history._rows = [None] * n
+        history._raw = text_lines
+        history._starts = np.concatenate(([0], ends[:n - 1] + 1)).tolist()
+        history._ends = ends[:n].tolist()
+        return history, n * BET_RECORD.size, int(ends[n - 1]) + 1 if n else 0
+    
+    def record(self, index: int) -> tuple:
+        """Numeric fields of the bet at index, in BET_RECORD order"""
+        return (
+            self.placed_at[index],
+            self.stakes[index],
+            self.odds[index],
+            self.confidences[index],
+            self.results[index],
+            self.profits[index],
+            self.settled_at[index]
+        )
+    
+    def texts(self, index: int) -> list:
+        """Text fields of the bet at index: [date, match, pattern]"""
+        row = self._rows[index]
+        if row is None:
+            line = self._raw[self._starts[index]:self._ends[index]]
+            row = self._rows[index] = orjson.loads(line) if orjson is not None else json.loads(line)
+        return row
+    
+    def to_records(self) -> np.ndarray:
+        """Numeric fields of every bet as a BET_RECORD_DTYPE array"""
+        n = self._n
+        records = np.empty(n, dtype=BET_RECORD_DTYPE)
+        records['ts'] = self.placed_at[:n]
+        records['stake'] = self.stakes[:n]
+        records['odds'] = self.odds[:n]
+        records['confidence'] = self.confidences[:n]
+        records['result'] = self.results[:n]
+        records['profit'] = self.profits[:n]
+        records['settled_at'] = self.settled_at[:n]
+        return records
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("bet index out of range")
+        result = int(self.results[index])
+        date, match, pattern = self.texts(index)
+        bet = {
+            'date': date,
+            'timestamp': _fmt_ts(self.placed_at[index]),
+            'match': match,
+            'pattern': pattern,
+            'stake': float(self.stakes[index]),
+            'odds': float(self.odds[index]),
+            'confidence': float(self.confidences[index]),
+            'result': None if result == self.PENDING else bool(result),
+            'profit': None if result == self.PENDING else float(self.profits[index])
+        }
+        if not np.isnan(self.settled_at[index]):
+            bet['settled_at'] = _fmt_ts(self.settled_at[index])
+        return bet
+    
+    def pending_indices(self) -> set:
+        """Indices of the bets not settled yet"""
+        return set(np.flatnonzero(self.results[:self._n] == self.PENDING).tolist())
+    
+    def losing_streak(self) -> int:
+        """Losses in a row at the end of the history, in settlement order"""
+        results = self.results[:self._n]
+        settled = np.flatnonzero(results != self.PENDING)
+        order = settled[np.argsort(self.settled_at[settled], kind='stable')]
+        wins = np.flatnonzero(results[order] == 1)
+        return int(len(order) - (wins[-1] + 1 if len(wins) else 0))
+    
+    def aggregates(self) -> tuple:
+        """(settled, wins, total_profit) over the whole history"""
+        results = self.results[:self._n]
+        settled = results != self.PENDING
+        return (
+            int(settled.sum()),
+            int((results == 1).sum()),
+            float(self.profits[:self._n][settled].sum())
+        )
+
 
 class BankrollManager:
     """Manage betting bankroll with Kelly Criterion and safety limits"""
     
+    _DIVIDER = "=" * 60
+    
+    # print_status report, formatted in one go
+    _STATUS_TEMPLATE = textwrap.dedent("""
+        {divider}
+        💰 BANKROLL STATUS
+        {divider}
+        Initial:  {initial:>10.2f}
+        Current:  {current:>10.2f} ({ratio:.1f}%)
+        Profit:   {profit:>+10.2f}
+        ROI:      {roi:>+9.1f}%
+        
+        📊 BETTING STATISTICS
+        {divider}
+        Total Bets:    {total:>3d}
+        Settled:       {settled:>3d}
+        Pending:       {pending:>3d}{win_lines}
+        
+        🚨 RISK METRICS
+        {divider}
+        Consecutive Losses: {consecutive}/{max_consecutive}
+        Stop-Loss Level:    {stop_loss:.2f}
+        
+        {verdict}
+        {divider}
+        
+    """)
+    
     def __init__(
         self,
         initial_bankroll: float,
@@ -30,7 +352,8 @@ class BankrollManager:
         max_daily_bets: int = 3,
         max_consecutive_losses: int = 3,
         kelly_fraction: float = 0.25,  # Quarter Kelly (conservative)
-        db_file: str = "bankroll.json"
+        db_file: str = DEFAULT_DB_FILE,
+        batch_mode: bool = False
     ):
         """
         Initialize bankroll manager.
@@ -42,7 +365,16 @@ class BankrollManager:
             max_daily_bets: Maximum bets per day
             max_consecutive_losses: Stop after this many losses in a row
             kelly_fraction: Fraction of Kelly to use (0.25 = quarter Kelly)
-            db_file: JSON file to persist bankroll state
+            db_file: File to persist bankroll state (.json, or .msgpack if
+                     msgpack is installed; an existing <stem>.json is
+                     converted on first load); bets go beside it in
+                     <stem>_bets.bin (fixed-size numeric records) and
+                     <stem>_bets.jsonl (date, match, pattern)
+            batch_mode: Keep bets and state in memory until flush() (for
+                        backtests replaying many bets); use as a context
+                        manager to flush on exit. Unflushed changes are
+                        also written when the manager is garbage collected
+                        or the interpreter exits
         """
         self.initial_bankroll = initial_bankroll
         self.current_bankroll = initial_bankroll
@@ -51,49 +383,195 @@ class BankrollManager:
         self.max_daily_bets = max_daily_bets
         self.max_consecutive_losses = max_consecutive_losses
         self.kelly_fraction = kelly_fraction
+        self.batch_mode = batch_mode
+        self._dirty = False
+        if batch_mode:
+            _BATCH_MANAGERS.add(self)
         self.db_file = Path(db_file)
+        if self.db_file.suffix == '.msgpack' and msgpack is None:
+            raise ImportError("msgpack is required for .msgpack bankroll files (pip install msgpack)")
+        # Bets are appended here; the state file only holds the running totals
+        self.bets_file = self.db_file.with_name(self.db_file.stem + '_bets.bin')
+        self.texts_file = self.db_file.with_name(self.db_file.stem + '_bets.jsonl')
         
-        self.bet_history = []
+        self.bet_history = BetHistory()
         self.consecutive_losses = 0
         self.daily_bets = {}  # {date: count}
+        self._today_cache = (None, 0.0)  # (YYYY-MM-DD, epoch of next local midnight)
+        
+        # Running aggregates over bet_history, kept current by settle_bet
+        self._settled_count = 0
+        self._wins = 0
+        self._total_profit = 0
         
         self._load_state()
+        
+        # Unsettled bet indices, kept current by place_bet/settle_bet
+        self._pending_indices = self.bet_history.pending_indices()
     
     def _load_state(self):
-        """Load bankroll state from JSON file"""
-        if self.db_file.exists():
-            with open(self.db_file, 'r') as f:
-                state = json.load(f)
-                self.current_bankroll = state.get('current_bankroll', self.initial_bankroll)
-                self.bet_history = state.get('bet_history', [])
-                self.consecutive_losses = state.get('consecutive_losses', 0)
-                self.daily_bets = state.get('daily_bets', {})
+        """Load bankroll state, migrating a legacy JSON file on first use"""
+        source = self.db_file
+        other = source.with_suffix('.msgpack' if source.suffix == '.json' else '.json')
+        if other.exists():
+            # The bet files are shared by stem, so the two state files would
+            # disagree about the same bets; never pick one silently
+            if source.exists():
+                raise ValueError(f"Both {source} and {other} exist; remove the stale one")
+            if other.suffix != '.json':
+                raise ValueError(f"Bankroll state is stored in {other}; pass db_file={str(other)!r}")
+            source = other
+        state = {}
+        if source.exists():
+            state = _decode_state(source)
+            self.current_bankroll = state.get('current_bankroll', self.initial_bankroll)
+            self.consecutive_losses = state.get('consecutive_losses', 0)
+            self.daily_bets = state.get('daily_bets', {})
+        
+        if self.bets_file.exists():
+            self._read_bets()
+        elif state.get('bet_history'):
+            # Older layout: the full history inline in the state file.
+            # Convert to the bet files once.
+            for bet in state['bet_history']:
+                self.bet_history.append(bet)
+            self._write_bets()
+        
+        # The bet files are written before the state file, so they are the
+        # record of truth: recount from them and bring a state file that
+        # missed the last settlements up to date
+        self._recount_aggregates()
+        if state.get('settled_bets', self._settled_count) != self._settled_count:
+            self.current_bankroll += self._total_profit - state['total_profit']
+            self.consecutive_losses = self.bet_history.losing_streak()
+        
+        if source != self.db_file or state.get('bet_history'):
+            # Rewrite the state in the current layout, replacing the JSON
+            # file when moving to MessagePack
+            self._save_state()
+            if source != self.db_file:
+                source.unlink()
+    
+    def _recount_aggregates(self):
+        """Recompute the running aggregates from the bet_history columns"""
+        self._settled_count, self._wins, self._total_profit = self.bet_history.aggregates()
+    
+    def _read_bets(self):
+        """
+        Load bet_history from the bet files.
+        
+        A write cut short can leave one trailing record or a partial text
+        line; that tail is truncated so later appends line up again.
+        
+        Raises:
+            ValueError: If the files disagree by more than one interrupted
+                append; both are left untouched for manual recovery
+        """
+        raw = self.bets_file.read_bytes()
+        records = np.frombuffer(raw, dtype=BET_RECORD_DTYPE, count=len(raw) // BET_RECORD.size)
+        text_lines = self.texts_file.read_bytes() if self.texts_file.exists() else b''
+        history, records_size, texts_size = BetHistory.from_records(records, text_lines)
+        
+        if len(raw) == records_size and len(text_lines) == texts_size:
+            self.bet_history = history
+            return
+        # _append_bet writes the record first, so a crash mid-append leaves at
+        # most one extra record and a partial text line. Anything else is not
+        # a torn append, and truncating would throw away real history.
+        if len(records) - len(history) > 1 or b'\n' in text_lines[texts_size:]:
+            lines = text_lines.count(b'\n')
+            raise ValueError(
+                f"{self.bets_file.name} holds {len(records)} bets but "
+                f"{self.texts_file.name} holds {lines}; "
+                f"restore the missing file before loading"
+            )
+        self.bet_history = history
+        os.truncate(self.bets_file, records_size)
+        if self.texts_file.exists():
+            os.truncate(self.texts_file, texts_size)
+    
+    def _write_bets(self):
+        """Write the whole bet_history to the bet files"""
+        history = self.bet_history
+        _atomic_write(self.bets_file, history.to_records().tobytes())
+        _atomic_write(self.texts_file, b''.join(_dumps_line(history.texts(i)) for i in range(len(history))))
+    
+    def flush(self):
+        """Persist bets and state held back in batch mode"""
+        if self._dirty:
+            self._write_bets()
+            self._save_state()
+            self._dirty = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+    
+    def __del__(self):
+        # Safety net for batch mode used without flush() or a with block
+        if getattr(self, '_dirty', False):
+            self.flush()
+    
+    def _append_bet(self, index: int):
+        """Append the bet at index to the bet files"""
+        with open(self.bets_file, 'ab') as f:
+            f.write(BET_RECORD.pack(*self.bet_history.record(index)))
+        with open(self.texts_file, 'ab') as f:
+            f.write(_dumps_line(self.bet_history.texts(index)))
+    
+    def _rewrite_bet(self, index: int):
+        """Overwrite the numeric record of the bet at index in place"""
+        with open(self.bets_file, 'r+b') as f:
+            f.seek(index * BET_RECORD.size)
+            f.write(BET_RECORD.pack(*self.bet_history.record(index)))
+    
+    def _today(self) -> str:
+        """Today's date string, recomputed only when the local day changes"""
+        now = time.time()
+        if now >= self._today_cache[1]:
+            today = datetime.fromtimestamp(now).date()
+            midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+            self._today_cache = (today.strftime('%Y-%m-%d'), midnight.timestamp())
+        return self._today_cache[0]
+    
+    def _prune_daily_bets(self):
+        """Drop daily counters outside the retention window so the state stays small"""
+        if len(self.daily_bets) <= DAILY_BETS_RETENTION_DAYS:
+            return
+        latest = datetime.strptime(max(self.daily_bets), '%Y-%m-%d')
+        cutoff = (latest - timedelta(days=DAILY_BETS_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        self.daily_bets = {d: c for d, c in self.daily_bets.items() if d >= cutoff}
     
     def _save_state(self):
-        """Save bankroll state to JSON file"""
+        """Save bankroll state to the state file"""
+        self._prune_daily_bets()
         state = {
             'initial_bankroll': self.initial_bankroll,
             'current_bankroll': self.current_bankroll,
-            'bet_history': self.bet_history,
             'consecutive_losses': self.consecutive_losses,
             'daily_bets': self.daily_bets,
-            'last_updated': datetime.now().isoformat()
+            'settled_bets': self._settled_count,
+            'wins': self._wins,
+            'total_profit': self._total_profit,
+            'last_updated': time.time()
         }
-        with open(self.db_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        _encode_state(self.db_file, state)
     
     def calculate_kelly_stake(
         self,
         confidence: float,
         odds: float,
-        pattern_name: Optional[str] = None
+        pattern_name: Optional[str] = None,
+        commission: float = 0.0
     ) -> float:
         """
         Calculate optimal stake using Kelly Criterion.
         
         Formula: f* = (bp - q) / b
         where:
-            b = odds - 1 (net odds)
+            b = (odds - 1) * (1 - commission) (net odds after commission)
             p = win probability (confidence)
             q = lose probability (1 - confidence)
         
@@ -101,19 +579,21 @@ class BankrollManager:
             confidence: Win probability (0-1)
             odds: Decimal odds (e.g., 1.30)
             pattern_name: Optional pattern name for logging
+            commission: Commission charged on winnings (0.05 = 5%, exchanges)
             
         Returns:
             Stake amount in currency units
         """
-        if confidence <= 0.5 or odds <= 1.0:
-            return 0.0  # No edge or invalid odds
-        
         # Calculate Kelly fraction
-        b = odds - 1  # Net odds
+        b = (odds - 1) * (1 - commission)  # Net odds
         p = confidence
         q = 1 - confidence
         
-        kelly = (b * p - q) / b
+        kelly = (b * p - q) / max(b, 1e-12)  # Floored to avoid dividing by zero
+        
+        # Zero out bets below 50% confidence or with no net payout without
+        # branching; max(0.0, ...) below then clamps every no-edge case to 0.0
+        kelly *= (confidence > 0.5) * (b > 0)
         
         # Apply conservative fraction (quarter Kelly reduces variance)
         conservative_kelly = kelly * self.kelly_fraction
@@ -126,10 +606,31 @@ class BankrollManager:
         final_stake = min(kelly_stake, max_stake)
         
         # Round to 2 decimals
-        final_stake = round(max(0, final_stake), 2)
+        final_stake = round(max(0.0, final_stake), 2)
         
         return final_stake
     
+    def calculate_kelly_stakes(self, confidences, odds, commission: float = 0.0) -> np.ndarray:
+        """
+        Vectorized calculate_kelly_stake for a whole slate of candidate bets.
+        
+        Args:
+            confidences: Win probabilities (array-like, 0-1)
+            odds: Decimal odds (array-like, same length)
+            commission: Commission charged on winnings
+            
+        Returns:
+            Array of stake amounts, 0 where there is no edge
+        """
+        return _kelly_batch(
+            np.asarray(confidences, dtype=np.float64),
+            np.asarray(odds, dtype=np.float64),
+            self.kelly_fraction,
+            self.max_stake_pct,
+            self.current_bankroll,
+            commission
+        )
+    
     def can_place_bet(self, date: Optional[str] = None) -> tuple[bool, str]:
         """
         Check if bet is allowed based on risk management rules.
@@ -141,7 +642,7 @@ class BankrollManager:
             (allowed: bool, reason: str)
         """
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = self._today()
         
         # Check stop-loss
         stop_loss_level = self.initial_bankroll * self.stop_loss_pct
@@ -183,31 +684,34 @@ class BankrollManager:
             True if bet placed successfully
         """
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = self._today()
         
         allowed, reason = self.can_place_bet(date)
         if not allowed:
             print(reason)
             return False
         
-        # Record bet
-        bet = {
+        # Record bet (result/profit are filled when settled)
+        self.bet_history.append({
+            'ts': time.time(),
             'date': date,
-            'timestamp': datetime.now().isoformat(),
             'match': match_info,
             'pattern': pattern,
             'stake': stake,
             'odds': odds,
-            'confidence': confidence,
-            'result': None,  # To be filled when settled
-            'profit': None
-        }
-        self.bet_history.append(bet)
+            'confidence': confidence
+        })
+        index = len(self.bet_history) - 1
+        self._pending_indices.add(index)
         
         # Update daily counter
         self.daily_bets[date] = self.daily_bets.get(date, 0) + 1
         
-        self._save_state()
+        if self.batch_mode:
+            self._dirty = True
+        else:
+            self._append_bet(index)
+            self._save_state()
         
         print(f"✅ Bet placed: {stake:.2f} on {pattern} @ {odds:.2f}")
         return True
@@ -220,15 +724,19 @@ class BankrollManager:
             bet_index: Index in bet_history
             won: True if bet won, False if lost
         """
-        if bet_index >= len(self.bet_history):
+        n = len(self.bet_history)
+        if not -n <= bet_index < n:
             print(f"❌ Invalid bet index: {bet_index}")
             return
+        if bet_index < 0:
+            bet_index += n
         
-        bet = self.bet_history[bet_index]
-        if bet['result'] is not None:
+        if bet_index not in self._pending_indices:
             print(f"⚠️ Bet already settled")
             return
         
+        bet = self.bet_history[bet_index]
+        
         stake = bet['stake']
         odds = bet['odds']
         
@@ -243,81 +751,94 @@ class BankrollManager:
             self.consecutive_losses += 1
             result_emoji = "❌"
         
-        bet['result'] = won
-        bet['profit'] = profit
-        bet['settled_at'] = datetime.now().isoformat()
-        
-        self._save_state()
+        ts = time.time()
+        self.bet_history.settle(bet_index, won, profit, ts)
         
-        print(f"{result_emoji} Bet settled: {bet['match']}")
-        print(f"   Profit: {profit:+.2f} | Bankroll: {self.current_bankroll:.2f} "
-              f"({self.current_bankroll/self.initial_bankroll*100:.1f}%)")
+        self._settled_count += 1
+        self._wins += 1 if won else 0
+        self._total_profit += profit
         
+        self._pending_indices.discard(bet_index)
+        if self.batch_mode:
+            self._dirty = True
+        else:
+            self._rewrite_bet(bet_index)
+            self._save_state()
+        
+        lines = [
+            f"{result_emoji} Bet settled: {bet['match']}",
+            f"   Profit: {profit:+.2f} | Bankroll: {self.current_bankroll:.2f} "
+            f"({self.current_bankroll/self.initial_bankroll*100:.1f}%)"
+        ]
         if self.consecutive_losses > 0:
-            print(f"   ⚠️ Consecutive losses: {self.consecutive_losses}")
+            lines.append(f"   ⚠️ Consecutive losses: {self.consecutive_losses}")
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def get_status(self) -> Dict:
         """Get current bankroll status"""
-        settled_bets = [b for b in self.bet_history if b['result'] is not None]
-        pending_bets = [b for b in self.bet_history if b['result'] is None]
+        settled = self._settled_count
+        wins = self._wins
+        initial = self.initial_bankroll
+        current = self.current_bankroll
         
-        if settled_bets:
-            wins = sum(1 for b in settled_bets if b['result'])
-            total_profit = sum(b['profit'] for b in settled_bets)
-            roi = (self.current_bankroll - self.initial_bankroll) / self.initial_bankroll * 100
+        if settled:
+            roi = (current - initial) / initial * 100
         else:
-            wins = 0
-            total_profit = 0
             roi = 0
         
         return {
-            'initial_bankroll': self.initial_bankroll,
-            'current_bankroll': self.current_bankroll,
+            'initial_bankroll': initial,
+            'current_bankroll': current,
             'total_bets': len(self.bet_history),
-            'settled_bets': len(settled_bets),
-            'pending_bets': len(pending_bets),
+            'settled_bets': settled,
+            'pending_bets': len(self._pending_indices),
             'wins': wins,
-            'losses': len(settled_bets) - wins,
-            'win_rate': wins / len(settled_bets) * 100 if settled_bets else 0,
-            'total_profit': total_profit,
+            'losses': settled - wins,
+            'win_rate': wins / settled * 100 if settled else 0,
+            'total_profit': self._total_profit,
             'roi': roi,
             'consecutive_losses': self.consecutive_losses,
-            'stop_loss_triggered': self.current_bankroll < (self.initial_bankroll * self.stop_loss_pct)
+            'stop_loss_triggered': current < (initial * self.stop_loss_pct)
         }
     
     def print_status(self):
         """Print formatted status report"""
         status = self.get_status()
-        
-        print(f"\n{'='*60}")
-        print(f"💰 BANKROLL STATUS")
-        print(f"{'='*60}")
-        print(f"Initial:  {status['initial_bankroll']:>10.2f}")
-        print(f"Current:  {status['current_bankroll']:>10.2f} "
-              f"({status['current_bankroll']/status['initial_bankroll']*100:.1f}%)")
-        print(f"Profit:   {status['total_profit']:>+10.2f}")
-        print(f"ROI:      {status['roi']:>+9.1f}%")
-        print(f"\n📊 BETTING STATISTICS")
-        print(f"{'='*60}")
-        print(f"Total Bets:    {status['total_bets']:>3d}")
-        print(f"Settled:       {status['settled_bets']:>3d}")
-        print(f"Pending:       {status['pending_bets']:>3d}")
-        if status['settled_bets'] > 0:
-            print(f"Wins/Losses:   {status['wins']:>3d}/{status['losses']:>3d}")
-            print(f"Win Rate:      {status['win_rate']:>5.1f}%")
-        print(f"\n🚨 RISK METRICS")
-        print(f"{'='*60}")
-        print(f"Consecutive Losses: {status['consecutive_losses']}/{self.max_consecutive_losses}")
-        print(f"Stop-Loss Level:    {self.initial_bankroll * self.stop_loss_pct:.2f}")
+        initial = status['initial_bankroll']
+        current = status['current_bankroll']
+        settled = status['settled_bets']
+        consecutive = status['consecutive_losses']
+        max_consecutive = self.max_consecutive_losses
+        
+        if settled > 0:
+            win_lines = (f"\nWins/Losses:   {status['wins']:>3d}/{status['losses']:>3d}"
+                         f"\nWin Rate:      {status['win_rate']:>5.1f}%")
+        else:
+            win_lines = ""
         
         if status['stop_loss_triggered']:
-            print(f"\n🛑 STOP-LOSS TRIGGERED - STOP BETTING!")
-        elif status['consecutive_losses'] >= self.max_consecutive_losses:
-            print(f"\n⚠️ MAX CONSECUTIVE LOSSES - COOLDOWN REQUIRED!")
+            verdict = "🛑 STOP-LOSS TRIGGERED - STOP BETTING!"
+        elif consecutive >= max_consecutive:
+            verdict = "⚠️ MAX CONSECUTIVE LOSSES - COOLDOWN REQUIRED!"
         else:
-            print(f"\n✅ Risk checks: PASSED")
-        
-        print(f"{'='*60}\n")
+            verdict = "✅ Risk checks: PASSED"
+        
+        sys.stdout.write(self._STATUS_TEMPLATE.format(
+            divider=self._DIVIDER,
+            initial=initial,
+            current=current,
+            ratio=current / initial * 100,
+            profit=status['total_profit'],
+            roi=status['roi'],
+            total=status['total_bets'],
+            settled=settled,
+            pending=status['pending_bets'],
+            win_lines=win_lines,
+            consecutive=consecutive,
+            max_consecutive=max_consecutive,
+            stop_loss=initial * self.stop_loss_pct,
+            verdict=verdict
+        ))
 
 
 def demo():
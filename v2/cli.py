@@ -11,7 +11,7 @@ from typing import Optional
 # Add v2 to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config.loader import create_config, add_config_args, config_from_args
+from config.loader import add_config_args, config_from_args
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -136,7 +136,7 @@ def cmd_backtest(args: argparse.Namespace) -> int:
             league_name=args.league,
             start_date=args.start_date,
             end_date=args.end_date,
-            config=config.core.__dict__  # Convert to dict
+            config=config.core
         )
         
         # Print results
@@ -144,9 +144,8 @@ def cmd_backtest(args: argparse.Namespace) -> int:
         
         # Save results if output directory specified
         if args.output_dir:
-            import os
             import json
-            from pathlib import Path
+            from dataclasses import asdict
             
             output_path = Path(args.output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
@@ -163,7 +162,8 @@ def cmd_backtest(args: argparse.Namespace) -> int:
                 'total_return': results.total_return,
                 'win_rate': results.win_rate,
                 'roi': results.roi,
-                'pattern_stats': results.pattern_stats
+                'pattern_stats': results.pattern_stats,
+                'config': asdict(config.core)
             }
             
             results_file = output_path / f"backtest_{args.league}_{args.start_date}_{args.end_date}.json"
@@ -306,15 +306,17 @@ def main() -> int:
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Add subcommands
+    # Each subcommand carries its handler; handlers import their heavy modules lazily
     backtest_parser = create_backtest_parser()
-    subparsers.add_parser('backtest', parents=[backtest_parser], add_help=False)
+    subparsers.add_parser('backtest', parents=[backtest_parser], add_help=False).set_defaults(func=cmd_backtest)
     
     walkforward_parser = create_walkforward_parser()
-    subparsers.add_parser('walkforward', parents=[walkforward_parser], add_help=False)
+    subparsers.add_parser('walkforward', parents=[walkforward_parser], add_help=False).set_defaults(func=cmd_walkforward)
     
     # Patterns command
     patterns_parser = subparsers.add_parser('patterns', help='List registered patterns')
     patterns_parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], default='INFO')
+    patterns_parser.set_defaults(func=cmd_patterns)
     
     # Enhanced backtest command
     enhanced_parser = create_base_parser()
@@ -326,27 +328,18 @@ def main() -> int:
     enhanced_parser.add_argument('--min-confidence', type=float, default=0.65, help='Minimum confidence threshold')
     enhanced_parser.add_argument('--max-bets-per-day', type=int, default=5, help='Maximum bets per day')
     add_config_args(enhanced_parser)
-    subparsers.add_parser('enhanced-backtest', parents=[enhanced_parser], add_help=False)
+    subparsers.add_parser('enhanced-backtest', parents=[enhanced_parser], add_help=False).set_defaults(func=cmd_enhanced_backtest)
     
     # Parse arguments
     args = parser.parse_args()
     
-    if not args.command:
+    # Subcommands set func; no subcommand means no handler
+    handler = getattr(args, 'func', None)
+    if handler is None:
         parser.print_help()
         return 1
     
-    # Route to appropriate command handler
-    if args.command == 'backtest':
-        return cmd_backtest(args)
-    elif args.command == 'enhanced-backtest':
-        return cmd_enhanced_backtest(args)
-    elif args.command == 'walkforward':
-        return cmd_walkforward(args)
-    elif args.command == 'patterns':
-        return cmd_patterns(args)
-    else:
-        print(f"Unknown command: {args.command}")
-        return 1
+    return handler(args)
 
 
 if __name__ == '__main__':
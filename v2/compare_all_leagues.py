@@ -3,6 +3,8 @@
 Compare Romanian Liga I, Bundesliga, and Premier League systems.
 """
 
+import pandas as pd
+
 print("="*80)
 print("3-LEAGUE BETTING SYSTEM PERFORMANCE COMPARISON")
 print("="*80)
@@ -68,59 +70,58 @@ leagues = {
     }
 }
 
+# One row per league; nested results flatten to e.g. season_validation_avg_win_rate
+df = pd.json_normalize(list(leagues.values()), sep='_')
+df.index = list(leagues)
+
+df['mp_profitable_pct'] = df['multi_period_profitable_periods'] / df['multi_period_periods_tested'] * 100
+df['sv_profitability'] = df['season_validation_profitable_seasons'] / df['season_validation_seasons_tested']
+df['sv_profitable_pct'] = df['sv_profitability'] * 100
+
 print("\n1. MULTI-PERIOD BACKTESTING RESULTS")
 print("-"*80)
 print(f"{'League':<20} {'Avg WR':<12} {'Profit':<15} {'Profitable %':<15}")
 print("-"*80)
 
-for league_name, data in leagues.items():
-    mp = data['multi_period']
-    profitable_pct = (mp['profitable_periods'] / mp['periods_tested'] * 100)
-    print(f"{league_name:<20} {mp['avg_win_rate']:>6.1f}%{'':<5} {mp['total_profit']:>+8.1f} units {profitable_pct:>5.0f}%")
+for league_name, wr, profit, pct in zip(df.index, df['multi_period_avg_win_rate'],
+                                        df['multi_period_total_profit'], df['mp_profitable_pct']):
+    print(f"{league_name:<20} {wr:>6.1f}%{'':<5} {profit:>+8.1f} units {pct:>5.0f}%")
 
 print("\n2. SEASON-BY-SEASON VALIDATION")
 print("-"*80)
 print(f"{'League':<20} {'Avg WR':<12} {'Profit':<15} {'Profitable %':<15}")
 print("-"*80)
 
-for league_name, data in leagues.items():
-    sv = data['season_validation']
-    profitable_pct = (sv['profitable_seasons'] / sv['seasons_tested'] * 100)
-    print(f"{league_name:<20} {sv['avg_win_rate']:>6.1f}%{'':<5} {sv['total_profit']:>+8.1f} units {profitable_pct:>5.0f}%")
+for league_name, wr, profit, pct in zip(df.index, df['season_validation_avg_win_rate'],
+                                        df['season_validation_total_profit'], df['sv_profitable_pct']):
+    print(f"{league_name:<20} {wr:>6.1f}%{'':<5} {profit:>+8.1f} units {pct:>5.0f}%")
 
 print("\n3. LEAGUE CHARACTERISTICS")
 print("-"*80)
 print(f"{'League':<20} {'Teams':<8} {'Matches/Season':<15} {'Avg Corners':<12} {'Avg Goals':<12}")
 print("-"*80)
 
-for league_name, data in leagues.items():
-    print(f"{league_name:<20} {data['num_teams']:<8} {data['matches_per_season']:<15} "
-          f"{data['avg_corners']:<12.2f} {data['avg_goals']:<12.2f}")
+for league_name, teams, matches, corners, goals in zip(df.index, df['num_teams'], df['matches_per_season'],
+                                                       df['avg_corners'], df['avg_goals']):
+    print(f"{league_name:<20} {teams:<8} {matches:<15} "
+          f"{corners:<12.2f} {goals:<12.2f}")
 
 print("\n4. PORTFOLIO ALLOCATION RECOMMENDATION")
 print("-"*80)
 
-# Calculate weighted scores (WR * volume * profitability)
-scores = {}
-for league_name, data in leagues.items():
-    sv = data['season_validation']
-    volume_factor = data['matches_per_season'] / 380  # Normalized to PL
-    win_rate_score = sv['avg_win_rate']
-    profitability = sv['profitable_seasons'] / sv['seasons_tested']
-    
-    scores[league_name] = win_rate_score * volume_factor * profitability
-
-total_score = sum(scores.values())
-allocations = {league: (score / total_score * 100) for league, score in scores.items()}
-
-for league_name in sorted(allocations, key=allocations.get, reverse=True):
-    data = leagues[league_name]
-    print(f"\n{league_name}: {allocations[league_name]:.0f}% of bankroll")
+# Weighted score (WR * volume * profitability), volume normalized to PL
+df['score'] = (df['season_validation_avg_win_rate']
+               * (df['matches_per_season'] / 380)
+               * df['sv_profitability'])
+df['allocation'] = df['score'] / df['score'].sum() * 100
+
+for row in df.sort_values('allocation', ascending=False, kind='stable').itertuples():
+    print(f"\n{row.Index}: {row.allocation:.0f}% of bankroll")
     print(f"  Rationale:")
-    print(f"    - Win Rate: {data['season_validation']['avg_win_rate']:.1f}%")
-    print(f"    - Profitability: {data['season_validation']['profitable_seasons']}/{data['season_validation']['seasons_tested']} seasons")
-    print(f"    - Volume: {data['matches_per_season']} matches/season")
-    print(f"    - Corner Market: {data['avg_corners']:.1f} avg (higher = better for our system)")
+    print(f"    - Win Rate: {row.season_validation_avg_win_rate:.1f}%")
+    print(f"    - Profitability: {row.season_validation_profitable_seasons}/{row.season_validation_seasons_tested} seasons")
+    print(f"    - Volume: {row.matches_per_season} matches/season")
+    print(f"    - Corner Market: {row.avg_corners:.1f} avg (higher = better for our system)")
 
 print("\n5. SYSTEM STRENGTHS BY LEAGUE")
 print("-"*80)
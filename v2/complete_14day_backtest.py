@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 """Complete backtest for ALL 4 leagues with detailed results"""
 
+import numpy as np
 import pandas as pd
 from datetime import timedelta, datetime
+import io
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
 
 # Configure backtest period (days)
 BACKTEST_DAYS = 30  # Change this to adjust backtest period
@@ -29,7 +34,64 @@ from patterns.premier_league_patterns import register_premier_league_patterns
 from patterns.bundesliga_patterns import register_bundesliga_patterns
 from patterns.la_liga_patterns import register_la_liga_patterns
 from patterns.romanian_patterns import register_romanian_patterns
-from patterns.registry import clear_patterns, get_pattern_registry
+from patterns.registry import clear_patterns, evaluate_bets, get_pattern_registry
+
+from _backtest_core import history_ends
+
+# One record per bet in the detail views (names truncated for the table)
+BET_RESULT_DTYPE = np.dtype([
+    ('date', 'M8[D]'),
+    ('home', 'U18'),
+    ('away', 'U18'),
+    ('pattern', 'U28'),
+    ('confidence', 'f8'),
+    ('fthg', 'i4'),
+    ('ftag', 'i4'),
+    ('outcome', '?'),
+])
+
+
+class Tee:
+    """Writes to several streams at once (e.g. console and results file)"""
+    
+    def __init__(self, *streams):
+        self.streams = streams
+    
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+    
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+
+def _bet_fields(best_bet):
+    """Pattern name and confidence of a best bet (La Liga returns a dict, the rest objects)"""
+    if isinstance(best_bet, dict):
+        pname = best_bet.get('pattern_name', best_bet.get('pattern'))
+        return pname, best_bet.get('risk_adjusted_confidence', best_bet.get('confidence'))
+    return best_bet.pattern_name, best_bet.risk_adjusted_confidence
+
+
+def _print_results(results, no_results=("No predictions generated.",)):
+    """Print the per-bet table and win rate, or no_results when nothing was bet"""
+    if len(results):
+        print(f"{'Date':<12} {'Match':<38} {'Pattern':<30} {'Conf':<6} {'Res':<4} {'Score':<5}")
+        print("-"*100)
+        for date, home, away, pattern, confidence, fthg, ftag, outcome in results.tolist():
+            match_str = f"{home} vs {away}"
+            result = '✅' if outcome else '❌'
+            score = f"{fthg}-{ftag}"
+            print(f"{date.isoformat():<12} {match_str:<38} {pattern:<30} {confidence*100:>5.1f}% {result:<4} {score:<5}")
+        
+        wins = int(results['outcome'].sum())
+        print(f"\nBets: {len(results)}, Wins: {wins}, Win Rate: {wins/len(results)*100:.1f}%")
+    else:
+        for line in no_results:
+            print(line)
+    
+    print()
 
 
 def show_premier_league_details():
@@ -52,237 +114,148 @@ def show_premier_league_details():
     print(f"Period: {start_date.date()} to {end_date.date()}")
     print(f"Total matches: {len(test_data)}\n")
     
-    results = []
+    patterns = {p.name: p for p in get_pattern_registry().get_all_patterns()}
+    
+    bets = []
     for idx, row in test_data.iterrows():
         try:
             # Premier League predictor returns a single dict (best bet), not a list
             best_bet = predictor.predict(row['home_team'], row['away_team'], row['date'])
             
             if best_bet and isinstance(best_bet, dict):
-                pattern = get_pattern_registry().get_pattern(best_bet['pattern'])
+                pattern = patterns.get(best_bet['pattern'])
                 outcome = pattern.label_fn(row) if pattern else False
                 
                 # Premier League uses FTHG/FTAG after column renaming in predictor.__init__
-                results.append({
-                    'date': row['date'].strftime('%Y-%m-%d'),
-                    'home': row['home_team'][:18],
-                    'away': row['away_team'][:18],
-                    'pattern': best_bet['pattern'][:28],
-                    'confidence': best_bet.get('risk_adjusted_confidence', best_bet.get('confidence')),
-                    'result': '✅' if outcome else '❌',
-                    'score': f"{int(row['FTHG'])}-{int(row['FTAG'])}"
-                })
+                bets.append((
+                    row['date'].date(),
+                    row['home_team'][:18],
+                    row['away_team'][:18],
+                    best_bet['pattern'][:28],
+                    best_bet.get('risk_adjusted_confidence', best_bet.get('confidence')),
+                    int(row['FTHG']),
+                    int(row['FTAG']),
+                    bool(outcome),
+                ))
         except Exception as e:
             # Skip matches with errors
             continue
     
-    # Display
-    if results:
-        print(f"{'Date':<12} {'Match':<38} {'Pattern':<30} {'Conf':<6} {'Res':<4} {'Score':<5}")
-        print("-"*100)
-        for r in results:
-            match_str = f"{r['home']} vs {r['away']}"
-            print(f"{r['date']:<12} {match_str:<38} {r['pattern']:<30} {r['confidence']*100:>5.1f}% {r['result']:<4} {r['score']:<5}")
-        
-        wins = sum(1 for r in results if r['result'] == '✅')
-        print(f"\nBets: {len(results)}, Wins: {wins}, Win Rate: {wins/len(results)*100:.1f}%")
-    else:
-        print("No predictions generated.")
-    
-    print()
+    results = np.array(bets, dtype=BET_RESULT_DTYPE)
+    _print_results(results)
     return results
 
 
-def show_bundesliga_details():
-    """Show Bundesliga detailed results"""
+def _show_league_details(title, data, register_fn, predictor_cls,
+                         no_results=("No predictions generated.",)):
+    """
+    Backtest the last BACKTEST_DAYS of a league and print every bet.
+    
+    Args:
+        title: League name for the header
+        data: Completed matches with Date, HomeTeam, AwayTeam, FTHG, FTAG, HC, AC
+        register_fn: Registers the league's patterns
+        predictor_cls: Predictor class (or factory) exposing predict_match(home, away, hist, date)
+        no_results: Lines printed when no bet was placed
+        
+    Returns:
+        BET_RESULT_DTYPE record array with one record per bet
+    """
     print("="*100)
-    print(f"BUNDESLIGA - Last {BACKTEST_DAYS} Days (Detailed)")
+    print(f"{title} - Last {BACKTEST_DAYS} Days (Detailed)")
     print("="*100)
     
-    # Load
-    data = load_bundesliga_data()
-    data = data[(data['HC'] >= 0) & (data['AC'] >= 0)]
-    
     # Setup
     clear_patterns()
-    register_bundesliga_patterns()
-    predictor = SimpleBundesligaPredictor()
+    register_fn()
+    predictor = predictor_cls()
+    
+    # Date-sorted history so all match cutoffs come from one binary search
+    if not data['Date'].is_monotonic_increasing:
+        data = data.sort_values('Date', kind='stable')
     
     # Period
     end_date = data['Date'].max()
     start_date = end_date - timedelta(days=BACKTEST_DAYS)
     test_data = data[(data['Date'] >= start_date) & (data['Date'] <= end_date)]
+    ends = history_ends(data['Date'].to_numpy(), test_data['Date'].to_numpy())
     
     print(f"Period: {start_date.date()} to {end_date.date()}")
     print(f"Total matches: {len(test_data)}\n")
     
-    results = []
-    for idx, row in test_data.iterrows():
-        hist = data[data['Date'] < row['Date']].tail(200)
-        if len(hist) < 30:
+    label_fns = {p.name: p.label_fn for p in get_pattern_registry().get_all_patterns()}
+    
+    # Preallocated for every test match; outcomes are settled after the loop,
+    # one vectorized evaluation per pattern
+    results = np.zeros(len(test_data), dtype=BET_RESULT_DTYPE)
+    bet_rows = []
+    bet_patterns = []
+    columns = (test_data['HomeTeam'], test_data['AwayTeam'], test_data['Date'],
+               test_data['FTHG'], test_data['FTAG'], ends)
+    for pos, (home, away, date, fthg, ftag, end) in enumerate(zip(*columns)):
+        # end matches precede this one; skip before slicing if too few
+        if end < 30:
             continue
+        hist = data.iloc[max(0, end - 200):end]
         
         # Get prediction - pass historical data only
-        best_bet = predictor.predict_match(row['HomeTeam'], row['AwayTeam'], hist, row['Date'])
+        best_bet = predictor.predict_match(home, away, hist, date)
         
         if best_bet:
-            pattern = get_pattern_registry().get_pattern(best_bet.pattern_name)
-            outcome = pattern.label_fn(row) if pattern else False
-            
-            results.append({
-                'date': row['Date'].strftime('%Y-%m-%d'),
-                'home': row['HomeTeam'][:18],
-                'away': row['AwayTeam'][:18],
-                'pattern': best_bet.pattern_name[:28],
-                'confidence': best_bet.risk_adjusted_confidence,
-                'result': '✅' if outcome else '❌',
-                'score': f"{int(row['FTHG'])}-{int(row['FTAG'])}"
-            })
+            pname, confidence = _bet_fields(best_bet)
+            results[len(bet_rows)] = (date.date(), home[:18], away[:18], pname[:28],
+                                      confidence, int(fthg), int(ftag), False)
+            bet_rows.append(pos)
+            bet_patterns.append(pname)
     
-    # Display
-    if results:
-        print(f"{'Date':<12} {'Match':<38} {'Pattern':<30} {'Conf':<6} {'Res':<4} {'Score':<5}")
-        print("-"*100)
-        for r in results:
-            match_str = f"{r['home']} vs {r['away']}"
-            print(f"{r['date']:<12} {match_str:<38} {r['pattern']:<30} {r['confidence']*100:>5.1f}% {r['result']:<4} {r['score']:<5}")
-        
-        wins = sum(1 for r in results if r['result'] == '✅')
-        print(f"\nBets: {len(results)}, Wins: {wins}, Win Rate: {wins/len(results)*100:.1f}%")
-    else:
-        print("No predictions generated.")
+    results = results[:len(bet_rows)]
     
-    print()
+    # Bets on a pattern missing from the registry count as losses
+    settled = [i for i, name in enumerate(bet_patterns) if name in label_fns]
+    results['outcome'][settled] = evaluate_bets(label_fns, test_data,
+                                                [bet_rows[i] for i in settled],
+                                                [bet_patterns[i] for i in settled])
+    
+    _print_results(results, no_results)
     return results
 
 
+def show_bundesliga_details():
+    """Show Bundesliga detailed results"""
+    # Loaded once; the predictor reuses the same frame
+    matches = load_bundesliga_data()
+    data = matches[(matches['HC'] >= 0) & (matches['AC'] >= 0)]
+    return _show_league_details("BUNDESLIGA", data, register_bundesliga_patterns,
+                                partial(SimpleBundesligaPredictor, data=matches))
+
+
 def show_laliga_details():
     """Show La Liga detailed results"""
-    print("="*100)
-    print(f"LA LIGA - Last {BACKTEST_DAYS} Days (Detailed)")
-    print("="*100)
-    
-    # Load
-    data = load_la_liga_data()
-    data = data[(data['HC'] >= 0) & (data['AC'] >= 0)]
-    
-    # Setup
-    clear_patterns()
-    register_la_liga_patterns()
-    predictor = SimpleLaLigaPredictor()
-    
-    # Period
-    end_date = data['Date'].max()
-    start_date = end_date - timedelta(days=BACKTEST_DAYS)
-    test_data = data[(data['Date'] >= start_date) & (data['Date'] <= end_date)]
-    
-    print(f"Period: {start_date.date()} to {end_date.date()}")
-    print(f"Total matches: {len(test_data)}\n")
-    
-    results = []
-    for idx, row in test_data.iterrows():
-        hist = data[data['Date'] < row['Date']].tail(200)
-        if len(hist) < 30:
-            continue
-        
-        best_bet = predictor.predict_match(row['HomeTeam'], row['AwayTeam'], hist, row['Date'])
-        
-        if best_bet:
-            pname = best_bet.get('pattern_name', best_bet.get('pattern'))
-            pattern = get_pattern_registry().get_pattern(pname)
-            outcome = pattern.label_fn(row) if pattern else False
-            
-            results.append({
-                'date': row['Date'].strftime('%Y-%m-%d'),
-                'home': row['HomeTeam'][:18],
-                'away': row['AwayTeam'][:18],
-                'pattern': pname[:28],
-                'confidence': best_bet.get('risk_adjusted_confidence', best_bet.get('confidence')),
-                'result': '✅' if outcome else '❌',
-                'score': f"{int(row['FTHG'])}-{int(row['FTAG'])}"
-            })
-    
-    # Display
-    if results:
-        print(f"{'Date':<12} {'Match':<38} {'Pattern':<30} {'Conf':<6} {'Res':<4} {'Score':<5}")
-        print("-"*100)
-        for r in results:
-            match_str = f"{r['home']} vs {r['away']}"
-            print(f"{r['date']:<12} {match_str:<38} {r['pattern']:<30} {r['confidence']*100:>5.1f}% {r['result']:<4} {r['score']:<5}")
-        
-        wins = sum(1 for r in results if r['result'] == '✅')
-        print(f"\nBets: {len(results)}, Wins: {wins}, Win Rate: {wins/len(results)*100:.1f}%")
-    else:
-        print("No predictions generated.")
-    
-    print()
-    return results
+    matches = load_la_liga_data()
+    data = matches[(matches['HC'] >= 0) & (matches['AC'] >= 0)]
+    return _show_league_details("LA LIGA", data, register_la_liga_patterns,
+                                partial(SimpleLaLigaPredictor, data=matches))
 
 
 def show_romania_details():
     """Show Romania detailed results"""
-    print("="*100)
-    print(f"ROMANIA LIGA I - Last {BACKTEST_DAYS} Days (Detailed)")
-    print("="*100)
-    
-    # Load
-    data = load_romanian_data()
+    matches = load_romanian_data()
     # Filter completed matches only (exclude 0-0 fixtures)
-    data = data[~((data['FTHG'] == 0) & (data['FTAG'] == 0))]
+    data = matches[~((matches['FTHG'] == 0) & (matches['FTAG'] == 0))]
     data = data[(data['HC'] >= 0) & (data['AC'] >= 0)]
-    
-    # Setup
-    clear_patterns()
-    register_romanian_patterns()
-    predictor = SimpleRomanianPredictor()
-    
-    # Period
-    end_date = data['Date'].max()
-    start_date = end_date - timedelta(days=BACKTEST_DAYS)
-    test_data = data[(data['Date'] >= start_date) & (data['Date'] <= end_date)]
-    
-    print(f"Period: {start_date.date()} to {end_date.date()}")
-    print(f"Total matches: {len(test_data)}\n")
-    
-    results = []
-    for idx, row in test_data.iterrows():
-        hist = data[data['Date'] < row['Date']].tail(200)
-        if len(hist) < 30:
-            continue
-        
-        # Get prediction using simple predictor
-        best_bet = predictor.predict_match(row['HomeTeam'], row['AwayTeam'], hist, row['Date'])
-        
-        if best_bet:
-            pattern = get_pattern_registry().get_pattern(best_bet.pattern_name)
-            outcome = pattern.label_fn(row) if pattern else False
-            
-            results.append({
-                'date': row['Date'].strftime('%Y-%m-%d'),
-                'home': row['HomeTeam'][:18],
-                'away': row['AwayTeam'][:18],
-                'pattern': best_bet.pattern_name[:28],
-                'confidence': best_bet.risk_adjusted_confidence,
-                'result': '✅' if outcome else '❌',
-                'score': f"{int(row['FTHG'])}-{int(row['FTAG'])}"
-            })
-    
-    # Display
-    if results:
-        print(f"{'Date':<12} {'Match':<38} {'Pattern':<30} {'Conf':<6} {'Res':<4} {'Score':<5}")
-        print("-"*100)
-        for r in results:
-            match_str = f"{r['home']} vs {r['away']}"
-            print(f"{r['date']:<12} {match_str:<38} {r['pattern']:<30} {r['confidence']*100:>5.1f}% {r['result']:<4} {r['score']:<5}")
-        
-        wins = sum(1 for r in results if r['result'] == '✅')
-        print(f"\nBets: {len(results)}, Wins: {wins}, Win Rate: {wins/len(results)*100:.1f}%")
-    else:
-        print("⚠️  No high-confidence predictions found in this period.")
-        print("    All patterns had confidence below their thresholds.")
-    
-    print()
-    return results
+    return _show_league_details(
+        "ROMANIA LIGA I", data, register_romanian_patterns,
+        partial(SimpleRomanianPredictor, data=matches),
+        no_results=("⚠️  No high-confidence predictions found in this period.",
+                    "    All patterns had confidence below their thresholds."))
+
+
+def _run_league(show_fn):
+    """Run one league's detail view in a worker process and return (report, results)"""
+    report = io.StringIO()
+    with redirect_stdout(report):
+        results = show_fn()
+    return report.getvalue(), results
 
 
 if __name__ == '__main__':
@@ -290,29 +263,22 @@ if __name__ == '__main__':
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_file = os.path.join(BACKTEST_DIR, f'all_leagues_{BACKTEST_DAYS}days_{timestamp}.txt')
     
-    # Open file for writing
-    with open(output_file, 'w') as f:
-        # Redirect print to file and console
-        original_print = print
-        def dual_print(*args, **kwargs):
-            # Remove 'file' from kwargs if present to avoid conflict
-            kwargs_copy = {k: v for k, v in kwargs.items() if k != 'file'}
-            original_print(*args, **kwargs_copy)  # Print to console
-            original_print(*args, **kwargs_copy, file=f)  # Print to file
-        
-        # Replace print temporarily
-        import builtins
-        builtins.print = dual_print
-        
+    # Tee stdout to the console and the results file for the whole run
+    with open(output_file, 'w', buffering=1 << 16) as f, redirect_stdout(Tee(sys.stdout, f)):
         print("\n" + "="*100)
         print(" "*20 + f"🏆 COMPLETE {BACKTEST_DAYS}-DAY BACKTEST - ALL LEAGUES 🏆")
         print("="*100 + "\n")
         
-        # Run all leagues
-        pl_results = show_premier_league_details()
-        bundesliga_results = show_bundesliga_details()
-        laliga_results = show_laliga_details()
-        romania_results = show_romania_details()
+        # Run all leagues in parallel; reports are printed in league order
+        league_fns = (show_premier_league_details, show_bundesliga_details,
+                      show_laliga_details, show_romania_details)
+        league_results = []
+        workers = min(len(league_fns), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for report, results in executor.map(_run_league, league_fns):
+                print(report, end='')
+                league_results.append(results)
+        pl_results, bundesliga_results, laliga_results, romania_results = league_results
         
         # Overall summary
         print("="*100)
@@ -333,9 +299,9 @@ if __name__ == '__main__':
         print("-"*100)
         
         for league, results in all_results.items():
-            if results:
+            if len(results):
                 bets = len(results)
-                wins = sum(1 for r in results if r['result'] == '✅')
+                wins = int(results['outcome'].sum())
                 losses = bets - wins
                 win_rate = wins / bets * 100 if bets > 0 else 0
                 
@@ -385,9 +351,6 @@ if __name__ == '__main__':
         print(f"Total Leagues: 4 (Premier League, Bundesliga, La Liga, Romania Liga I)")
         print(f"Output File: {output_file}")
         print("="*100)
-        
-        # Restore original print
-        builtins.print = original_print
     
     print(f"\n✅ Results saved to: {output_file}")
     print(f"📊 Total bets analyzed: {total_bets}")
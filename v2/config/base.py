@@ -2,19 +2,26 @@
 Base configuration dataclasses for the v2 football betting system.
 Provides typed configuration with clear contracts and defaults.
 """
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from dataclasses import dataclass, field, fields, is_dataclass, replace
+from types import MappingProxyType
+from typing import Any, Dict, Final, Mapping, Optional
 from enum import Enum
 
 
+# Pattern category names, used directly as confidence_thresholds keys
+CATEGORY_GOALS: Final[str] = "goals"
+CATEGORY_CORNERS: Final[str] = "corners"
+CATEGORY_CARDS: Final[str] = "cards"
+
+
 class PatternCategory(Enum):
-    """Pattern categories for betting patterns."""
-    GOALS = "goals"
-    CORNERS = "corners"
-    CARDS = "cards"
+    """Pattern categories for betting patterns (kept for compatibility; prefer the CATEGORY_* strings)."""
+    GOALS = CATEGORY_GOALS
+    CORNERS = CATEGORY_CORNERS
+    CARDS = CATEGORY_CARDS
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CoreConfig:
     """Core system configuration."""
     # Data paths
@@ -35,7 +42,15 @@ class CoreConfig:
     min_training_days: int = 90
 
 
-@dataclass
+# Read-only defaults; each ThresholdConfig gets its own copy
+_DEFAULT_CONFIDENCE_THRESHOLDS = MappingProxyType({
+    CATEGORY_GOALS: 0.65,
+    CATEGORY_CORNERS: 0.60,
+    CATEGORY_CARDS: 0.70
+})
+
+
+@dataclass(frozen=True, slots=True)
 class ThresholdConfig:
     """Pattern threshold configuration."""
     # Global minimums
@@ -45,18 +60,16 @@ class ThresholdConfig:
     max_coverage: float = 0.95
     
     # Category-specific confidence thresholds
-    confidence_thresholds: Dict[str, float] = field(default_factory=lambda: {
-        PatternCategory.GOALS.value: 0.65,
-        PatternCategory.CORNERS.value: 0.60,
-        PatternCategory.CARDS.value: 0.70
-    })
+    confidence_thresholds: Dict[str, float] = field(
+        default_factory=lambda: dict(_DEFAULT_CONFIDENCE_THRESHOLDS)
+    )
     
     # Dynamic threshold learning
     use_dynamic_thresholds: bool = False
     threshold_learning_window: int = 30
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
     """Model training configuration."""
     # Model selection
@@ -77,7 +90,7 @@ class ModelConfig:
     feature_subset_size: Optional[float] = 0.8
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProfitabilityConfig:
     """Profitability scoring weights."""
     accuracy_weight: float = 0.50
@@ -90,7 +103,7 @@ class ProfitabilityConfig:
     variance_weight: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     """Complete system configuration."""
     core: CoreConfig = field(default_factory=CoreConfig)
@@ -105,10 +118,22 @@ class Config:
     def __post_init__(self):
         """Apply league-specific overrides after initialization."""
         if self.league_name and self.league_overrides:
-            league_config = self.league_overrides.get(self.league_name, {})
-            for section, overrides in league_config.items():
-                if hasattr(self, section):
-                    section_config = getattr(self, section)
-                    for key, value in overrides.items():
-                        if hasattr(section_config, key):
-                            setattr(section_config, key, value)
+            _override_sections(self, self.league_overrides.get(self.league_name, {}))
+
+
+def _override_sections(config: Config, overrides: Mapping[str, Mapping[str, Any]]) -> None:
+    """
+    Swap config sections for copies with {section: {key: value}} overrides applied.
+    
+    Unknown sections and keys are ignored. Only meant for use while a Config is
+    being built (its __post_init__ and config.loader.create_config); afterwards
+    the config is treated as immutable.
+    """
+    for section, values in overrides.items():
+        section_config = getattr(config, section, None)
+        if not is_dataclass(section_config):
+            continue
+        names = {f.name for f in fields(section_config)}
+        known = {key: value for key, value in values.items() if key in names}
+        if known:
+            object.__setattr__(config, section, replace(section_config, **known))
@@ -6,7 +6,10 @@ import json
 import argparse
 from pathlib import Path
 from typing import Dict, Any, Optional
-from .base import Config, CoreConfig, ThresholdConfig, ModelConfig, ProfitabilityConfig
+from .base import (
+    CATEGORY_CARDS, CATEGORY_CORNERS, CATEGORY_GOALS,
+    Config, CoreConfig, ThresholdConfig, ModelConfig, ProfitabilityConfig, _override_sections
+)
 
 
 def load_league_overrides(config_path: Optional[str] = None) -> Dict[str, Any]:
@@ -55,13 +58,8 @@ def create_config(
 
 
 def _apply_config_overrides(config: Config, overrides: Dict[str, Any]) -> None:
-    """Apply configuration overrides to existing config instance."""
-    for section_name, section_overrides in overrides.items():
-        if hasattr(config, section_name):
-            section_config = getattr(config, section_name)
-            for key, value in section_overrides.items():
-                if hasattr(section_config, key):
-                    setattr(section_config, key, value)
+    """Apply configuration overrides to a config that is still being created."""
+    _override_sections(config, overrides)
 
 
 def add_config_args(parser: argparse.ArgumentParser) -> None:
@@ -113,11 +111,11 @@ def config_from_args(args: argparse.Namespace, league_name: Optional[str] = None
     # Confidence thresholds
     confidence_overrides = {}
     if args.confidence_goals is not None:
-        confidence_overrides['goals'] = args.confidence_goals
+        confidence_overrides[CATEGORY_GOALS] = args.confidence_goals
     if args.confidence_corners is not None:
-        confidence_overrides['corners'] = args.confidence_corners
+        confidence_overrides[CATEGORY_CORNERS] = args.confidence_corners
     if args.confidence_cards is not None:
-        confidence_overrides['cards'] = args.confidence_cards
+        confidence_overrides[CATEGORY_CARDS] = args.confidence_cards
     if confidence_overrides:
         threshold_overrides['confidence_thresholds'] = confidence_overrides
     
@@ -0,0 +1,84 @@
+"""
+On-disk cache for converted match data.
+Loaders re-read and re-convert the season CSVs on every run; cached_frame()
+keeps the converted DataFrame in data/.cache and reuses it while the size
+and modification time of each source file (the CSV or the adapter module
+itself) match the ones recorded with it.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+
+
+def _signature(sources: List[Path]) -> List[Optional[Tuple[int, int]]]:
+    """(size, mtime_ns) of each source file, None where it does not exist"""
+    signature = []
+    for p in sources:
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((st.st_size, st.st_mtime_ns))
+    return signature
+
+
+def cached_frame(
+    name: str,
+    sources: Iterable[Union[str, Path]],
+    build: Callable[[], pd.DataFrame]
+) -> pd.DataFrame:
+    """
+    Return build()'s DataFrame, cached on disk until a source file changes.
+
+    Args:
+        name: Readable cache file prefix (e.g. the season file stem)
+        sources: Files the result is derived from; their paths key the cache
+                 and any change in their size or modification time
+                 invalidates it
+        build: Produces the DataFrame on a cache miss
+
+    Returns:
+        The cached or freshly built DataFrame
+    """
+    sources = [Path(p) for p in sources]
+    key = hashlib.sha1("\0".join(str(p.resolve()) for p in sources).encode()).hexdigest()[:12]
+    cache_path = CACHE_DIR / f"{name}-{key}.pkl"
+    signature = _signature(sources)
+
+    if cache_path.exists():
+        try:
+            cached = pd.read_pickle(cache_path)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            logger.warning(f"Ignoring unreadable cache {cache_path.name}: {e}")
+        else:
+            # Caches from before signatures were recorded hold a bare DataFrame
+            if isinstance(cached, dict) and cached.get("sources") == signature:
+                return cached["frame"]
+
+    df = build()
+
+    # Write to a temp file and rename so concurrent loaders never read a partial cache
+    tmp_path = None
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        pd.to_pickle({"sources": signature, "frame": df}, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write cache {cache_path.name}: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return df
@@ -7,6 +7,8 @@ import pandas as pd
 from pathlib import Path
 from typing import List, Optional
 
+from .cache import cached_frame
+
 # Premier League data directory
 PREMIER_LEAGUE_DATA_DIR = Path(__file__).parent / "premiere_league"
 
@@ -57,7 +59,18 @@ class PremierLeagueDataAdapter:
         
         if not filepath.exists():
             raise FileNotFoundError(f"Season file not found: {filepath}")
-            
+        
+        # Converted season is cached until the CSV or this module changes
+        return cached_frame(
+            f"{filepath.stem}-{'all' if include_future else 'complete'}",
+            [filepath, Path(__file__)],
+            lambda: self._read_season(filepath, season_start_year, include_future)
+        )
+    
+    def _read_season(self, filepath: Path, season_start_year: int, include_future: bool) -> pd.DataFrame:
+        """Read one season CSV and convert it to the internal format."""
+        season_end_year = season_start_year + 1
+        
         # Read CSV
         df = pd.read_csv(filepath)
         
@@ -9,6 +9,8 @@ from typing import List, Optional
 import logging
 from datetime import datetime
 
+from .cache import cached_frame
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,14 +103,13 @@ class RomanianDataAdapter:
         return cleaned_df
     
     def _load_single_season(self, filepath: Path) -> pd.DataFrame:
-        """Load and convert a single season file."""
-        # Load raw data
-        df = pd.read_csv(filepath)
-        
-        # Convert to standard format
-        converted_df = self._convert_format(df)
-        
-        return converted_df
+        """Load and convert a single season file (cached until the CSV or this module changes)."""
+        # Load raw data and convert to standard format
+        return cached_frame(
+            filepath.stem,
+            [filepath, Path(__file__)],
+            lambda: self._convert_format(pd.read_csv(filepath))
+        )
     
     def _convert_format(self, df: pd.DataFrame) -> pd.DataFrame:
         """Convert Romanian format to standard format."""
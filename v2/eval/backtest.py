@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
 
+from config.base import CoreConfig
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +34,7 @@ def run_simple_backtest(
     league_name: str,
     start_date: str,
     end_date: str,
-    config: Optional[Dict] = None
+    config: Optional[CoreConfig] = None
 ) -> BacktestResult:
     """
     Run a simple backtest on Romanian league data.
@@ -41,13 +43,13 @@ def run_simple_backtest(
         league_name: League name (currently supports 'Romania')
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
-        config: Optional configuration
+        config: Optional core configuration (defaults to CoreConfig())
         
     Returns:
         BacktestResult with performance metrics
     """
     if config is None:
-        config = {}
+        config = CoreConfig()
     
     logger.info(f"Starting backtest: {league_name} from {start_date} to {end_date}")
     
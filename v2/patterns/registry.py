@@ -2,9 +2,10 @@
 Pattern registry for football betting patterns.
 Provides clean interface for pattern registration and retrieval.
 """
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
 from .categories import PatternCategory
 
 
@@ -141,6 +142,67 @@ def clear_patterns() -> None:
     _global_registry.clear()
 
 
+def evaluate_labels(label_fn: Callable[[pd.Series], bool], df: pd.DataFrame) -> np.ndarray:
+    """
+    Evaluate a pattern label function over every row of a DataFrame.
+    
+    Label functions written as plain column arithmetic and comparisons
+    (e.g. ``row['FTHG'] > 0.5``) are called once on the whole frame. Functions
+    that need scalar semantics (``and``/``or``, ``if``) raise or return a
+    non-row-aligned result on a frame and are evaluated row by row instead.
+    
+    Args:
+        label_fn: Pattern label function taking a match row
+        df: Match DataFrame
+        
+    Returns:
+        Boolean array aligned with the rows of df
+    """
+    try:
+        result = label_fn(df)
+    except (ValueError, TypeError):
+        result = None
+    
+    if isinstance(result, (pd.Series, np.ndarray)) and result.dtype == bool and len(result) == len(df):
+        return np.asarray(result, dtype=bool)
+    
+    return np.fromiter((bool(label_fn(row)) for _, row in df.iterrows()), dtype=bool, count=len(df))
+
+
+
+def evaluate_bets(
+    label_fns: Mapping[str, Callable[[pd.Series], bool]],
+    df: pd.DataFrame,
+    rows: Sequence[int],
+    pattern_names: Sequence[str]
+) -> np.ndarray:
+    """
+    Settle a batch of pattern bets against actual results.
+    
+    Bet i is on pattern_names[i] for the match at position rows[i] of df. Each
+    pattern's label function is evaluated once over all rows bet on it (see
+    evaluate_labels), rather than once per bet.
+    
+    Args:
+        label_fns: Label function per pattern name
+        df: Match DataFrame with actual results
+        rows: Positional row index of each bet's match
+        pattern_names: Pattern name of each bet
+        
+    Returns:
+        Boolean array of bet outcomes, aligned with rows
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    names = np.asarray(pattern_names, dtype=object)
+    outcomes = np.zeros(len(rows), dtype=bool)
+    
+    for name in dict.fromkeys(pattern_names):
+        idx = np.flatnonzero(names == name)
+        outcomes[idx] = evaluate_labels(label_fns[name], df.iloc[rows[idx]])
+    
+    return outcomes
+
+
 # Example pattern definitions
 def _home_over_1_5_goals(row: pd.Series) -> bool:
     """Pattern: Home team scores over 1.5 goals."""
@@ -77,18 +77,12 @@ def load_romanian_data() -> pd.DataFrame:
             'Timestamp': df['timestamp']
         })
         
-        # Add result column for completed matches
-        def get_result(row):
-            if pd.isna(row['FTHG']) or pd.isna(row['FTAG']):
-                return None
-            if row['FTHG'] > row['FTAG']:
-                return 'H'
-            elif row['FTAG'] > row['FTHG']:
-                return 'A'
-            else:
-                return 'D'
-        
-        df_mapped['FTR'] = df_mapped.apply(get_result, axis=1)
+        # Add result for completed matches
+        home_goals = df_mapped['FTHG'].to_numpy()
+        away_goals = df_mapped['FTAG'].to_numpy()
+        result = np.select([home_goals > away_goals, away_goals > home_goals], ['H', 'A'], default='D')
+        played = (df_mapped['FTHG'].notna() & df_mapped['FTAG'].notna()).to_numpy()
+        df_mapped['FTR'] = np.where(played, result, None)
         data_frames.append(df_mapped)
     
     combined_data = pd.concat(data_frames, ignore_index=True)
@@ -34,6 +34,9 @@ BUNDESLIGA_TIMEFRAME_WEIGHTS = {
     365: 0.05,    # Last 365 days - Full Season (5%)
 }
 
+# Entries kept per feature cache (team stats, pattern confidences) before the oldest are evicted
+FEATURE_CACHE_SIZE = 20000
+
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
@@ -60,9 +63,9 @@ class SimpleBettingRecommendation:
 class SimpleBundesligaPredictor:
     """Simplified Bundesliga predictor using form-weighted heuristics"""
     
-    def __init__(self):
-        # Load historical data
-        self.data = load_bundesliga_data(include_future=False)
+    def __init__(self, data: Optional[pd.DataFrame] = None):
+        # Load historical data (or reuse a frame the caller already loaded)
+        self.data = load_bundesliga_data(include_future=False) if data is None else data
         print(f"Loaded {len(self.data)} Bundesliga matches")
         print(f"Date range: {self.data['Date'].min()} to {self.data['Date'].max()}")
         
@@ -113,6 +116,48 @@ class SimpleBundesligaPredictor:
             'over_9_5_corners': 3.20,
             'over_10_5_corners': 4.50,
         }
+        # Odds are looked up by substring match, so memoize per pattern name
+        self._odds_cache: Dict[str, float] = {}
+        
+        # Per-history feature caches: every match on a date usually sees the
+        # same history slice, so team form/corner style and pattern confidences
+        # are computed once per (team or pattern, date, slice) and reused across
+        # matches and backtests. Bounded to FEATURE_CACHE_SIZE entries each.
+        self._team_stats_cache: Dict[Tuple, Tuple[float, Dict[str, float]]] = {}
+        self._confidence_cache: Dict[Tuple, float] = {}
+    
+    def clear_cache(self):
+        """Drop cached team stats and pattern confidences (e.g. between leagues)"""
+        self._team_stats_cache.clear()
+        self._confidence_cache.clear()
+    
+    @staticmethod
+    def _history_key(historical_data: pd.DataFrame) -> Tuple:
+        """Identify a history slice by its length and first/last index labels"""
+        if len(historical_data) == 0:
+            return (0,)
+        index = historical_data.index
+        return (len(historical_data), index[0], index[-1])
+    
+    @staticmethod
+    def _cache_put(cache: Dict, key: Tuple, value):
+        """Store value, evicting the oldest entry once the cache is full"""
+        if len(cache) >= FEATURE_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = value
+    
+    def _team_stats(self, team: str, is_home: bool, historical_data: pd.DataFrame,
+                    before_date: datetime) -> Tuple[float, Dict[str, float]]:
+        """Recent form and corner style of a team, cached per (team, venue, date, history slice)"""
+        key = (team, is_home, pd.Timestamp(before_date)) + self._history_key(historical_data)
+        stats = self._team_stats_cache.get(key)
+        if stats is None:
+            stats = (
+                self.get_team_recent_form(team, historical_data),
+                self.get_team_corner_style(team, historical_data, is_home=is_home),
+            )
+            self._cache_put(self._team_stats_cache, key, stats)
+        return stats
     
     def get_team_recent_form(self, team: str, historical_data: pd.DataFrame) -> float:
         """Calculate recent form score with 3x weighting for last 5 matches"""
@@ -260,13 +305,13 @@ class SimpleBundesligaPredictor:
         recommendations = []
         registry = get_pattern_registry()
         
-        # Get team forms
-        home_form = self.get_team_recent_form(home_team, historical_data)
-        away_form = self.get_team_recent_form(away_team, historical_data)
-        
-        # IMPROVEMENT #2: Corner style analysis
-        home_corner_style = self.get_team_corner_style(home_team, historical_data, is_home=True)
-        away_corner_style = self.get_team_corner_style(away_team, historical_data, is_home=False)
+        # Get team forms and IMPROVEMENT #2: Corner style analysis
+        home_form, home_corner_style = self._team_stats(
+            home_team, True, historical_data, match_date
+        )
+        away_form, away_corner_style = self._team_stats(
+            away_team, False, historical_data, match_date
+        )
         
         # IMPROVEMENT #10: Season adjustment
         season_mult = self.get_season_adjustment(match_date)
@@ -383,6 +428,11 @@ class SimpleBundesligaPredictor:
         
         # Use ensemble method if we have a match date
         if match_date:
+            # Team-independent, so shared by every match on this date
+            key = (pattern_name, pd.Timestamp(match_date)) + self._history_key(historical_data)
+            if key in self._confidence_cache:
+                return self._confidence_cache[key]
+            
             # Using optimized extreme_recent weights from comprehensive testing
             # Bundesliga: 52.6% WR across 38 active patterns
             confidence, debug_info = calculate_multi_timeframe_confidence(
@@ -394,6 +444,7 @@ class SimpleBundesligaPredictor:
                 custom_timeframes=BUNDESLIGA_TIMEFRAME_WEIGHTS,
                 use_all_history=True  # UPGRADE #1: Use all historical data for trend analysis
             )
+            self._cache_put(self._confidence_cache, key, confidence)
             return confidence
         
         # Fallback to legacy method if no match_date
@@ -421,10 +472,14 @@ class SimpleBundesligaPredictor:
     
     def _estimate_odds(self, pattern_name: str) -> float:
         """Estimate odds for a pattern"""
-        for key, odds in self.expected_odds.items():
-            if key.replace('_', ' ') in pattern_name.replace('_', ' '):
-                return odds
-        return 2.0  # Default
+        if pattern_name not in self._odds_cache:
+            spaced_name = pattern_name.replace('_', ' ')
+            self._odds_cache[pattern_name] = next(
+                (odds for key, odds in self.expected_odds.items()
+                 if key.replace('_', ' ') in spaced_name),
+                2.0  # Default
+            )
+        return self._odds_cache[pattern_name]
 
 
 def main():
@@ -468,9 +523,14 @@ def main():
     # Generate predictions
     all_recommendations = []
     
-    for _, match in test_matches.iterrows():
+    # The adapter returns matches sorted by date, so each match's history is
+    # a positional slice ending at its binary-searched cut-off
+    window = args.lookback * 9 // 34
+    ends = np.searchsorted(all_data['Date'].to_numpy(), test_matches['Date'].to_numpy(), side='left')
+    
+    for (_, match), end in zip(test_matches.iterrows(), ends):
         # Get historical data up to this match
-        historical = all_data[all_data['Date'] < match['Date']].tail(args.lookback * 9 // 34)
+        historical = all_data.iloc[max(0, end - window):end]
         
         if len(historical) < 50:
             continue
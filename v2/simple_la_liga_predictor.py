@@ -49,12 +49,12 @@ class SimpleLaLigaPredictor:
     6. Confidence calibration
     """
     
-    def __init__(self, lookback_days: int = 30):
-        """Initialize La Liga predictor with lookback period"""
+    def __init__(self, lookback_days: int = 30, data: Optional[pd.DataFrame] = None):
+        """Initialize La Liga predictor with lookback period (and optionally preloaded matches)"""
         self.lookback_days = lookback_days
         
-        # Load historical data
-        self.data = load_la_liga_data(include_future=False)
+        # Load historical data (or reuse a frame the caller already loaded)
+        self.data = load_la_liga_data(include_future=False) if data is None else data
         print(f"Loaded {len(self.data)} La Liga matches")
         print(f"Date range: {self.data['Date'].min()} to {self.data['Date'].max()}")
         
@@ -124,6 +124,8 @@ class SimpleLaLigaPredictor:
             'over_10_5_corners': 2.60,
             'over_11_5_corners': 3.50,
         }
+        # Odds are looked up by substring match, so memoize per pattern name
+        self._odds_cache: Dict[str, float] = {}
     
     def get_team_recent_form(self, team: str, historical_data: pd.DataFrame) -> float:
         """Calculate recent form score with 3x weighting for last 5 matches"""
@@ -420,10 +422,14 @@ class SimpleLaLigaPredictor:
     
     def _estimate_odds(self, pattern_name: str) -> float:
         """Estimate odds for a pattern"""
-        for key, odds in self.expected_odds.items():
-            if key.replace('_', ' ') in pattern_name.replace('_', ' '):
-                return odds
-        return 2.0
+        if pattern_name not in self._odds_cache:
+            spaced_name = pattern_name.replace('_', ' ')
+            self._odds_cache[pattern_name] = next(
+                (odds for key, odds in self.expected_odds.items()
+                 if key.replace('_', ' ') in spaced_name),
+                2.0  # Default
+            )
+        return self._odds_cache[pattern_name]
 
 
 def main():
@@ -462,8 +468,13 @@ def main():
     
     all_recommendations = []
     
-    for _, match in test_matches.iterrows():
-        historical = all_data[all_data['Date'] < match['Date']].tail(args.lookback * 9 // 38)
+    # The adapter returns matches sorted by date, so each match's history is
+    # a positional slice ending at its binary-searched cut-off
+    window = args.lookback * 9 // 38
+    ends = np.searchsorted(all_data['Date'].to_numpy(), test_matches['Date'].to_numpy(), side='left')
+    
+    for (_, match), end in zip(test_matches.iterrows(), ends):
+        historical = all_data.iloc[max(0, end - window):end]
         
         if len(historical) < 50:
             continue
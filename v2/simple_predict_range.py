@@ -93,6 +93,8 @@ class SimpleRomanianPredictor:
             'over_9_5_corners': 3.20,
             'over_10_5_corners': 4.50,
         }
+        # Odds are looked up by substring match, so memoize per pattern name
+        self._odds_cache: Dict[str, float] = {}
     
     def get_team_recent_form(self, team: str, historical_data: pd.DataFrame) -> float:
         """Calculate recent form score with 3x weighting for last 5 matches"""
@@ -736,10 +738,12 @@ class SimpleRomanianPredictor:
     
     def get_expected_odds(self, pattern_name: str) -> float:
         """Get expected odds for a pattern"""
-        for bet_type, odds in self.expected_odds.items():
-            if bet_type in pattern_name:
-                return odds
-        return 2.00
+        if pattern_name not in self._odds_cache:
+            self._odds_cache[pattern_name] = next(
+                (odds for bet_type, odds in self.expected_odds.items() if bet_type in pattern_name),
+                2.00
+            )
+        return self._odds_cache[pattern_name]
     
     def predict_match(self, home_team: str, away_team: str, historical_data: pd.DataFrame) -> List[SimpleBettingRecommendation]:
         """Predict betting opportunities for a match with enhanced accuracy filters"""
@@ -847,16 +851,17 @@ def load_romanian_data() -> pd.DataFrame:
         })
         
         # Add result for completed matches
-        def get_result(row):
-            if pd.isna(row['FTHG']) or pd.isna(row['FTAG']):
-                return None
-            return 'H' if row['FTHG'] > row['FTAG'] else ('A' if row['FTAG'] > row['FTHG'] else 'D')
-        
-        df_mapped['FTR'] = df_mapped.apply(get_result, axis=1)
+        home_goals = df_mapped['FTHG'].to_numpy()
+        away_goals = df_mapped['FTAG'].to_numpy()
+        result = np.select([home_goals > away_goals, away_goals > home_goals], ['H', 'A'], default='D')
+        played = (df_mapped['FTHG'].notna() & df_mapped['FTAG'].notna()).to_numpy()
+        df_mapped['FTR'] = np.where(played, result, None)
         data_frames.append(df_mapped)
     
     combined_data = pd.concat(data_frames, ignore_index=True)
     combined_data = combined_data.dropna(subset=['HomeTeam', 'AwayTeam'])
+    # Categorical teams: the predictor's per-team filters compare integer codes
+    combined_data[['HomeTeam', 'AwayTeam']] = combined_data[['HomeTeam', 'AwayTeam']].astype('category')
     
     print(f"✅ Loaded {len(combined_data)} total matches")
     return combined_data
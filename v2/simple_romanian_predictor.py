@@ -36,11 +36,13 @@ class BestBet:
 class SimpleRomanianPredictor:
     """Simple Romanian Liga I predictor matching Bundesliga/La Liga approach"""
     
-    def __init__(self):
-        """Initialize with pattern registry"""
-        # Load data first
-        from data.romanian_adapter import load_romanian_data
-        self.data = load_romanian_data(include_future=False)
+    def __init__(self, data: Optional[pd.DataFrame] = None):
+        """Initialize with pattern registry (and optionally preloaded matches)"""
+        # Load data first, unless the caller already has it
+        if data is None:
+            from data.romanian_adapter import load_romanian_data
+            data = load_romanian_data(include_future=False)
+        self.data = data
         print(f"Loaded {len(self.data)} Romanian Liga I matches")
         print(f"Date range: {self.data['Date'].min()} to {self.data['Date'].max()}")
         
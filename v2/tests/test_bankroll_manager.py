@@ -0,0 +1,127 @@
+"""
+Persistence tests for BankrollManager's bet files.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bankroll_manager import BET_RECORD, BankrollManager
+
+
+def _manager(tmp_path, **kwargs):
+    return BankrollManager(100.0, max_daily_bets=10, db_file=str(tmp_path / 'bankroll.json'), **kwargs)
+
+
+def _place(manager, match, odds=1.5):
+    manager.place_bet(2.0, 'total_over_8_5_corners', 0.8, odds, match, date='2025-01-01')
+
+
+def test_reload_after_stray_record_keeps_files_aligned(tmp_path):
+    manager = _manager(tmp_path)
+    for i in range(3):
+        _place(manager, f'm{i}')
+    manager.settle_bet(1, True)
+    
+    # A crash between the two appends leaves an extra numeric record
+    with open(manager.bets_file, 'ab') as f:
+        f.write(BET_RECORD.pack(0.0, 9.0, 9.0, 0.9, -1, float('nan'), float('nan')))
+    
+    reloaded = _manager(tmp_path)
+    assert len(reloaded.bet_history) == 3
+    assert reloaded.get_status()['settled_bets'] == 1
+    _place(reloaded, 'new match', odds=2.0)
+    
+    bets = list(_manager(tmp_path).bet_history)
+    assert [bet['match'] for bet in bets] == ['m0', 'm1', 'm2', 'new match']
+    assert bets[3]['stake'] == 2.0 and bets[3]['odds'] == 2.0
+    assert manager.bets_file.stat().st_size == 4 * BET_RECORD.size
+
+
+def test_reload_after_partial_text_line_keeps_files_aligned(tmp_path):
+    manager = _manager(tmp_path)
+    for i in range(2):
+        _place(manager, f'm{i}')
+    
+    # A crash mid-way through the text append leaves an unterminated line
+    with open(manager.texts_file, 'ab') as f:
+        f.write(b'["2025-01-01", "stray')
+    
+    reloaded = _manager(tmp_path)
+    assert len(reloaded.bet_history) == 2
+    _place(reloaded, 'new match')
+    
+    assert [bet['match'] for bet in _manager(tmp_path).bet_history] == ['m0', 'm1', 'new match']
+
+
+def test_reload_recounts_settlement_missing_from_state(tmp_path):
+    manager = _manager(tmp_path)
+    for i in range(2):
+        _place(manager, f'm{i}')
+    manager.settle_bet(0, False)
+    stale_state = manager.db_file.read_bytes()
+    manager.settle_bet(1, False)
+    
+    # A crash after the bet record was rewritten but before the state save
+    manager.db_file.write_bytes(stale_state)
+    
+    status = _manager(tmp_path).get_status()
+    assert status['settled_bets'] == 2 and status['total_profit'] == -4.0
+    assert status['current_bankroll'] == 96.0
+    assert status['consecutive_losses'] == 2
+
+
+def test_reload_with_missing_text_file_keeps_bet_records(tmp_path):
+    manager = _manager(tmp_path)
+    for i in range(2):
+        _place(manager, f'm{i}')
+    manager.texts_file.unlink()
+    
+    with pytest.raises(ValueError):
+        _manager(tmp_path)
+    assert manager.bets_file.stat().st_size == 2 * BET_RECORD.size
+
+
+def test_refuses_to_choose_between_json_and_msgpack_state(tmp_path):
+    manager = _manager(tmp_path)
+    _place(manager, 'm0')
+    (tmp_path / 'bankroll.msgpack').write_bytes(b'')
+    
+    with pytest.raises(ValueError):
+        _manager(tmp_path)
+
+
+def test_settle_rejects_index_below_history_start(tmp_path, capsys):
+    manager = _manager(tmp_path)
+    _place(manager, 'm0')
+    manager.settle_bet(-2, True)
+    
+    assert "Invalid bet index: -2" in capsys.readouterr().out
+    assert manager.get_status()['pending_bets'] == 1
+
+
+def test_batch_mode_flushes_when_manager_is_collected(tmp_path):
+    manager = _manager(tmp_path, batch_mode=True)
+    _place(manager, 'm0')
+    manager.settle_bet(0, True)
+    del manager
+    
+    bets = list(_manager(tmp_path).bet_history)
+    assert [bet['match'] for bet in bets] == ['m0']
+    assert bets[0]['result'] is True
+
+
+def test_batch_mode_flushes_at_interpreter_exit(tmp_path):
+    # Module-level references are only released at shutdown, after atexit hooks
+    script = (
+        "import sys; sys.path.insert(0, {root!r})\n"
+        "from bankroll_manager import BankrollManager\n"
+        "MANAGER = BankrollManager(100.0, db_file={db!r}, batch_mode=True)\n"
+        "MANAGER.place_bet(2.0, 'p', 0.8, 1.5, 'm0', date='2025-01-01')\n"
+    ).format(root=str(Path(__file__).resolve().parents[1]), db=str(tmp_path / 'bankroll.json'))
+    subprocess.run([sys.executable, '-c', script], check=True, capture_output=True)
+    
+    assert [bet['match'] for bet in _manager(tmp_path).bet_history] == ['m0']
@@ -11,6 +11,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Callable, Dict, Tuple
 
+from patterns.registry import evaluate_labels
+
 
 def calculate_multi_timeframe_confidence(
     data: pd.DataFrame,
@@ -72,6 +74,14 @@ def calculate_multi_timeframe_confidence(
                 timeframes[99999] = 0.00  # All history gets 0% direct weight
                                            # (but used for trend/consistency analysis)
     
+    # Label every prior match once; each timeframe's success rate is then the
+    # mean over a date window of the same label array
+    dates = data['Date'].to_numpy()
+    match_ts = pd.Timestamp(match_date).to_datetime64()
+    prior = dates < match_ts
+    prior_dates = dates[prior]
+    labels = evaluate_labels(pattern_fn, data[prior]) if len(prior_dates) > 0 else np.zeros(0, dtype=bool)
+    
     # Calculate success rate for each timeframe
     timeframe_results = {}
     confidences = []
@@ -79,15 +89,15 @@ def calculate_multi_timeframe_confidence(
     for days, weight in timeframes.items():
         if days == 99999:
             # ALL historical data
-            tf_data = data[data['Date'] < match_date]
+            tf_labels = labels
         else:
-            cutoff = match_date - timedelta(days=days)
-            tf_data = data[(data['Date'] >= cutoff) & (data['Date'] < match_date)]
+            cutoff = pd.Timestamp(match_date - timedelta(days=days)).to_datetime64()
+            tf_labels = labels[prior_dates >= cutoff]
         
-        if len(tf_data) > 0:
-            success_rate = tf_data.apply(pattern_fn, axis=1).mean()
+        if len(tf_labels) > 0:
+            success_rate = tf_labels.mean()
             timeframe_results[days] = {
-                'matches': len(tf_data),
+                'matches': len(tf_labels),
                 'success': success_rate,
                 'weight': weight
             }